@@ -0,0 +1,721 @@
+import math
+import os
+import random
+import time
+from array import array
+from collections import deque
+from itertools import islice
+
+from engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+
+
+class LatencyStats:
+    """Per-move planning latency, recent window plus running totals"""
+    def __init__(self, window=1024, budget=None):
+        self.budget = budget
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.over_budget = 0
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds):
+        """Add one planning time"""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if self.budget is not None and seconds > self.budget:
+            self.over_budget += 1
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the recent window in seconds"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def summary(self):
+        """Latency summary in milliseconds"""
+        return {
+            "moves": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+            "over_budget": self.over_budget,
+        }
+
+
+class Planner:
+    """Base autopilot: times decide() into stats and maps cells to moves
+
+    walls lists the board's blocked cells (see SnakeEngine); they are
+    also set in the occupancy grid the planners search. Planners that
+    ponder can use spare time between decisions through ponder().
+    """
+    name = None
+    ponders = False
+
+    def __init__(self, cols, rows, budget=None, walls=()):
+        self.cols = cols
+        self.rows = rows
+        self.budget = budget
+        self.walls = tuple(walls)
+        self.stats = LatencyStats(budget=budget)
+        self._neighbors = [self._cell_neighbors(cell) for cell in range(cols * rows)]
+        self._moves = {1: RIGHT, -1: LEFT, cols: DOWN, -cols: UP}
+
+    def _cell_neighbors(self, cell):
+        y, x = divmod(cell, self.cols)
+        cells = []
+        if x > 0:
+            cells.append(cell - 1)
+        if x < self.cols - 1:
+            cells.append(cell + 1)
+        if y > 0:
+            cells.append(cell - self.cols)
+        if y < self.rows - 1:
+            cells.append(cell + self.cols)
+        return tuple(cells)
+
+    def decide(self, engine):
+        """Direction for the next tick, timed into stats"""
+        start = time.perf_counter()
+        deadline = start + self.budget if self.budget else float('inf')
+        try:
+            cell = self._next_cell(engine, deadline)
+        except TimeoutError:
+            cell = self._on_timeout(engine)
+        self.stats.record(time.perf_counter() - start)
+        if cell is None:
+            return engine.direction
+        return self._moves[cell - engine.snake.head]
+
+    def _next_cell(self, engine, deadline):
+        """Cell the head should move into next"""
+        raise NotImplementedError
+
+    def ponder(self, engine, deadline):
+        """Think about the position the next decide() will see until the perf_counter() deadline"""
+
+    def close(self):
+        """Release whatever the planner holds, e.g. worker processes"""
+
+    def _on_timeout(self, engine):
+        return self._roomiest_move(engine)
+
+    def _behind(self, engine):
+        """Cell the reversal guard forbids entering"""
+        if engine.dx == 0 and engine.dy == 0:
+            return -1
+        return engine.snake.head - engine.dx - engine.dy * self.cols
+
+    def _roomiest_move(self, engine):
+        """Fallback: free neighbor with the most free neighbors of its own"""
+        snake = engine.snake
+        behind = self._behind(engine)
+        best, best_room = None, -1
+        for cell in self._neighbors[snake.head]:
+            if cell == behind or snake.collides(cell, engine.length):
+                continue
+            room = sum(1 for nb in self._neighbors[cell] if not snake.grid[nb])
+            if room > best_room:
+                best, best_room = cell, room
+        return best
+
+
+class BFSPlanner(Planner):
+    """Greedy autopilot: shortest safe path to the food, else chase the tail
+
+    Searches run over the engine's occupancy grid with preallocated
+    buffers that are reused every tick; a generation stamp replaces
+    clearing them. A path to food is only taken if a virtual snake that
+    followed it could still reach its own tail. The verified path is then
+    replayed move by move until the food moves or the snake goes off plan.
+    """
+    name = 'bfs'
+
+    def __init__(self, cols, rows, budget=None, walls=()):
+        super().__init__(cols, rows, budget, walls)
+        size = cols * rows
+        self._seen = array('I', bytes(4 * size))
+        self._parent = array('i', bytes(4 * size))
+        self._queue = array('i', bytes(4 * size))
+        self._grid = bytearray(size)  # Scratch occupancy for the safety checks
+        self._stamp = 0
+        self._plan = deque()
+        self._plan_food = None
+
+    def _on_timeout(self, engine):
+        self._plan.clear()
+        return self._roomiest_move(engine)
+
+    def _next_cell(self, engine, deadline):
+        snake = engine.snake
+        head = snake.head
+        plan = self._plan
+        if (plan and self._plan_food == engine.food and self._is_neighbor(head, plan[0])
+                and not snake.collides(plan[0], engine.length)):
+            return plan.popleft()
+        plan.clear()
+
+        behind = self._behind(engine)
+        path = self._search(head, engine.food, snake.grid, behind, deadline)
+        if path and self._safe_after(engine, path, deadline):
+            self._plan.extend(path)
+            self._plan_food = engine.food
+            return self._plan.popleft()
+        return self._chase_tail(engine, behind, deadline)
+
+    def _is_neighbor(self, a, b):
+        return b in self._neighbors[a]
+
+    def _search(self, start, goal, blocked, skip, deadline):
+        """BFS from start to goal; goal may be blocked (e.g. the tail)
+
+        Returns the path excluding start, or None.
+        """
+        self._stamp += 1
+        if self._stamp >= 0xFFFFFFFF:
+            self._seen = array('I', bytes(len(self._seen) * 4))
+            self._stamp = 1
+        stamp = self._stamp
+        seen, parent, queue = self._seen, self._parent, self._queue
+        neighbors = self._neighbors
+        clock = time.perf_counter
+
+        seen[start] = stamp
+        queue[0] = start
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                return path
+            for nb in neighbors[cell]:
+                if seen[nb] != stamp and (not blocked[nb] or nb == goal) and nb != skip:
+                    seen[nb] = stamp
+                    parent[nb] = cell
+                    queue[write] = nb
+                    write += 1
+            if not read & 511 and clock() > deadline:
+                raise TimeoutError
+        return None
+
+    def _virtual_body(self, engine, path):
+        """(tail, head, length) after following path to its end
+
+        The scratch grid is set to the occupancy at that point; it is
+        overwritten in place, so checks allocate nothing.
+        """
+        body = engine.snake.body
+        grid = self._grid
+        grid[:] = engine.snake.grid
+        count = len(body) + len(path)
+        drop = max(0, count - engine.length)
+        for cell in islice(body, min(drop, len(body))):
+            grid[cell] = 0
+        for cell in islice(path, max(0, drop - len(body)), None):
+            grid[cell] = 1
+        tail = body[drop] if drop < len(body) else path[drop - len(body)]
+        return tail, path[-1], count - drop
+
+    def _safe_after(self, engine, path, deadline):
+        """Whether the snake could still reach its tail after following path"""
+        tail, head, length = self._virtual_body(engine, path)
+        if length < 3:
+            return True
+        return self._search(head, tail, self._grid, -1, deadline) is not None
+
+    def _chase_tail(self, engine, behind, deadline):
+        """Stall by following the tail, preferring the longest way round"""
+        snake = engine.snake
+        best, best_len = None, -1
+        for cell in self._neighbors[snake.head]:
+            if cell == behind or snake.collides(cell, engine.length):
+                continue
+            tail, _, length = self._virtual_body(engine, (cell,))
+            if length < 2:
+                return cell
+            path = self._search(cell, tail, self._grid, -1, deadline)
+            if path is not None and len(path) > best_len:
+                best, best_len = cell, len(path)
+        if best is None:
+            return self._roomiest_move(engine)
+        return best
+
+
+def hamiltonian_cycle(cols, rows):
+    """Successor table of a Hamiltonian cycle over the board, or None
+
+    Row 0 is walked left to right, the remaining rows serpentine over
+    columns 1.. and column 0 leads back up to the start. Needs an even
+    number of rows; boards with even columns are built transposed.
+    """
+    if cols < 2 or rows < 2:
+        return None
+    if rows % 2:
+        if cols % 2:
+            return None
+        transposed = hamiltonian_cycle(rows, cols)
+        succ = array('i', bytes(4 * cols * rows))
+        for cell, nxt in enumerate(transposed):
+            # Transposed cell (x', y') = (y, x)
+            y, x = divmod(cell, rows)
+            ny, nx = divmod(nxt, rows)
+            succ[x * cols + y] = nx * cols + ny
+        return succ
+
+    path = [x for x in range(cols)]
+    for y in range(1, rows):
+        xs = range(cols - 1, 0, -1) if y % 2 else range(1, cols)
+        path.extend(y * cols + x for x in xs)
+    path.extend(y * cols for y in range(rows - 1, 0, -1))
+
+    succ = array('i', bytes(4 * cols * rows))
+    for cell, nxt in zip(path, path[1:] + path[:1]):
+        succ[cell] = nxt
+    return succ
+
+
+def is_cycle(succ, cols, rows):
+    """Whether succ steps between neighboring cells through every cell once, back to 0"""
+    size = cols * rows
+    if len(succ) != size:
+        return False
+    seen = bytearray(size)
+    cell = 0
+    for _ in range(size):
+        if seen[cell]:
+            return False
+        seen[cell] = 1
+        nxt = succ[cell]
+        if not 0 <= nxt < size or abs(nxt % cols - cell % cols) + abs(nxt // cols - cell // cols) != 1:
+            return False
+        cell = nxt
+    return cell == 0
+
+
+def load_cycle(cols, rows, cache_dir=None):
+    """Hamiltonian successor table, cached on disk per board size
+
+    A cached table that is not a cycle (stale or corrupt) is rebuilt.
+    """
+    cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.cache', 'hebi')
+    path = os.path.join(cache_dir, f"hamilton-{cols}x{rows}.bin")
+    size = cols * rows
+    try:
+        with open(path, 'rb') as f:
+            succ = array('i')
+            succ.fromfile(f, size)
+        if is_cycle(succ, cols, rows):
+            return succ
+    except (OSError, EOFError):
+        pass
+
+    succ = hamiltonian_cycle(cols, rows)
+    if succ is None:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            succ.tofile(f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # A read-only cache only costs a rebuild next time
+    return succ
+
+
+class HamiltonianPlanner(Planner):
+    """Autopilot that follows a Hamiltonian cycle, taking safe shortcuts
+
+    Following the cycle can never trap the snake, so it can fill the
+    whole board. While the snake is short it may skip ahead on the cycle
+    toward the food, as long as the new head stays strictly between the
+    head and the tail in cycle order with room left for growth. Every
+    decision looks at no more than four neighbors: O(1) per move.
+
+    Boards with an odd number of cells or with walls get no Hamiltonian
+    cycle; there the BFS planner is used instead.
+    """
+    name = 'hamilton'
+
+    # Stop taking shortcuts once the snake covers this share of the board
+    SHORTCUT_LIMIT = 0.5
+
+    def __init__(self, cols, rows, budget=None, walls=(), cache_dir=None):
+        super().__init__(cols, rows, budget, walls)
+        self.succ = None if self.walls else load_cycle(cols, rows, cache_dir)
+        self._fallback = None
+        if self.succ is None:
+            self._fallback = BFSPlanner(cols, rows, budget, walls)
+            self.stats = self._fallback.stats
+            return
+        self.order = array('i', bytes(4 * cols * rows))
+        cell = 0
+        for i in range(cols * rows):
+            self.order[cell] = i
+            cell = self.succ[cell]
+
+    def decide(self, engine):
+        if self._fallback:
+            return self._fallback.decide(engine)
+        return super().decide(engine)
+
+    def _next_cell(self, engine, deadline):
+        snake = engine.snake
+        head, tail = snake.head, snake.tail
+        order = self.order
+        size = len(order)
+        nxt = self.succ[head]
+        if engine.length > size * self.SHORTCUT_LIMIT:
+            return nxt
+
+        here = order[head]
+        to_tail = (order[tail] - here) % size or size
+        to_food = (order[engine.food] - here) % size
+        # Cells the body still has to grow into stay free
+        room = to_tail - (engine.length - len(snake)) - 1
+        behind = self._behind(engine)
+
+        best, best_gap = nxt, (to_food - 1) % size
+        for cell in self._neighbors[head]:
+            if cell == behind or snake.grid[cell]:
+                continue
+            skip = (order[cell] - here) % size
+            if skip >= room or skip > to_food:
+                continue
+            gap = to_food - skip
+            if gap < best_gap:
+                best, best_gap = cell, gap
+        if best == behind:
+            # Only a one-segment snake can be turned back on itself
+            return self._roomiest_move(engine)
+        return best
+
+
+class _Node:
+    """Search tree node: visit count, summed rollout value, children by cell"""
+    __slots__ = ('visits', 'value', 'children')
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+
+
+class LookaheadPlanner(Planner):
+    """Monte Carlo tree search over simulated moves up to the next food
+
+    Each iteration walks down the tree by UCB1, adds one move and plays a
+    random rollout from there, biased toward the food. A rollout is worth
+    more the sooner it eats, nothing if it dies and SURVIVED if it is
+    still alive at the horizon. The food after the next one is unknown,
+    so eating ends the simulation; eating or surviving into a position
+    where the head can no longer reach the tail counts as TRAPPED.
+
+    Simulations run on scratch copies of the grid and body that are
+    overwritten in place, so rollouts allocate nothing per step. The
+    subtree under the chosen move is kept for the next tick while the
+    game goes where the search expected and the food stays put, and
+    ponder() grows it between ticks, so in the game most of a decision's
+    search happens in the frames before it. With
+    workers, that many extra processes search the same position each
+    tick and their root statistics are merged in. Workers stop early
+    enough for their results to arrive by the deadline, allowing for
+    the transfer time seen so far; results that come later are dropped.
+    Without a time budget every tick runs `rollouts` iterations.
+    """
+    name = 'lookahead'
+    ponders = True
+
+    EXPLORATION = 0.7  # UCB1 constant
+    SURVIVED = 0.4  # Value of a rollout that reaches the horizon alive
+    TRAPPED = 0.05  # Value of ending cut off from the tail
+    GREEDY = 0.75  # Chance a rollout step heads for the food rather than a random free cell
+    RESERVE = 0.02  # Share of the budget not spent searching
+
+    def __init__(self, cols, rows, budget=None, walls=(), rollouts=200, horizon=None, workers=0,
+                 seed=None):
+        super().__init__(cols, rows, budget, walls)
+        size = cols * rows
+        self.rollouts = rollouts
+        self.horizon = horizon or cols + rows
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.simulated = 0  # Iterations run, this process only
+        self.search_time = 0.0
+        self.late = 0  # Worker results dropped for missing the deadline
+        self.transfer = 0.001  # Smoothed seconds from a worker finishing to its result arriving
+        self._xs = array('i', (cell % cols for cell in range(size)))
+        self._ys = array('i', (cell // cols for cell in range(size)))
+        # Scratch state: the root position, and the copy each iteration plays on
+        self._root_grid = bytearray(size)
+        self._root_body = array('i', bytes(4 * (size + self.horizon + 1)))
+        self._grid = bytearray(size)
+        self._body = array('i', bytes(4 * (size + self.horizon + 1)))
+        self._seen = array('I', bytes(4 * size))
+        self._queue = array('i', bytes(4 * size))
+        self._stamp = 0
+        self._length = 0
+        self._grow = 0
+        self._food = -1
+        self._tree = None
+        self._expect = None
+        self._pool = None
+
+    def close(self):
+        """Stop the worker processes, if any were started"""
+        if self._pool:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _next_cell(self, engine, deadline):
+        snake = engine.snake
+        root = self._tree if self._expect == (snake.head, engine.food) else None
+        root = root or _Node()
+
+        # Leave a little of the budget for merging and picking the move
+        deadline -= (self.budget or 0) * self.RESERVE
+        futures = []
+        if self.workers:
+            futures = self._submit(engine, deadline)
+        start = time.perf_counter()
+        self._search(engine, root, deadline, self.rollouts)
+        self.search_time += time.perf_counter() - start
+        if futures:
+            self._merge(root, futures, deadline)
+
+        if not root.children:
+            self._tree = self._expect = None
+            return self._roomiest_move(engine)
+        cell = max(root.children, key=lambda cell: root.children[cell].visits)
+        self._tree = root.children[cell]
+        self._expect = (cell, engine.food)
+        return cell
+
+    def ponder(self, engine, deadline):
+        if not engine.alive or time.perf_counter() >= deadline:
+            return
+        key = (engine.snake.head, engine.food)
+        if self._tree is None or self._expect != key:
+            self._tree, self._expect = _Node(), key
+        start = time.perf_counter()
+        self._search(engine, self._tree, deadline, 0)
+        self.search_time += time.perf_counter() - start
+
+    def _submit(self, engine, deadline):
+        """Start this tick's searches in the worker processes"""
+        from concurrent.futures import ProcessPoolExecutor
+        from state import GameState
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        data = bytes(GameState.capture(engine).buffer())
+        # perf_counter() is system-wide on Linux, macOS and Windows, so the
+        # workers can be handed an absolute deadline
+        stop = None if deadline == float('inf') else deadline - 2 * self.transfer
+        futures = [self._pool.submit(_search_worker, self.cols, self.rows, self.walls, self.horizon,
+                                     data, stop, self.rollouts, self.rng.getrandbits(32))
+                   for _ in range(self.workers)]
+        for future in futures:
+            future.add_done_callback(self._arrived)
+        return futures
+
+    def _arrived(self, future):
+        """Track how long worker results take to get here, runs on the pool's thread"""
+        if not future.cancelled() and future.exception() is None:
+            transfer = time.perf_counter() - future.result()[1]
+            self.transfer += (transfer - self.transfer) / 4
+
+    def _merge(self, root, futures, deadline):
+        """Add the root statistics of the worker searches back by the deadline"""
+        from concurrent.futures import wait
+        timeout = None if deadline == float('inf') else max(0.0, deadline - time.perf_counter())
+        done, late = wait(futures, timeout)
+        for future in late:
+            future.cancel()  # Only stops it if it has not started, else it runs to its deadline
+        self.late += len(late)
+        for future in done:
+            for cell, visits, value in future.result()[0]:
+                child = root.children.get(cell)
+                if child is None:
+                    child = root.children[cell] = _Node()
+                child.visits += visits
+                child.value += value
+                root.visits += visits
+
+    def _search(self, engine, root, deadline, iterations):
+        """Grow the tree under root until the deadline, or for iterations without one"""
+        snake = engine.snake
+        self._root_grid[:] = snake.grid
+        body = self._root_body
+        for i, cell in enumerate(snake.body):
+            body[i] = cell
+        self._length = len(snake)
+        self._grow = engine.length - len(snake)
+        self._food = engine.food
+        behind = self._behind(engine)
+        done = 0
+        if deadline == float('inf'):
+            for done in range(1, iterations + 1):
+                self._iterate(root, behind)
+        else:
+            # Stop while there is still room for an iteration twice as long as the last
+            clock = time.perf_counter
+            now = clock()
+            cost = 0.0
+            while now + 2 * cost < deadline:
+                self._iterate(root, behind)
+                done += 1
+                cost = clock() - now
+                now += cost
+        self.simulated += done
+        return root
+
+    def _iterate(self, root, behind):
+        """One selection, expansion, rollout and backup pass from root"""
+        grid, body = self._grid, self._body
+        grid[:] = self._root_grid
+        body[:] = self._root_body
+        head_i, tail_i, grow = self._length - 1, 0, self._grow
+        head, food, horizon = body[head_i], self._food, self.horizon
+        exploration = self.EXPLORATION
+        node, path, depth = root, [root], 0
+        while True:
+            tail = body[tail_i]
+            moves = [cell for cell in self._neighbors[head]
+                     if cell != behind and (not grid[cell] or cell == tail and not grow)]
+            behind = -1  # The reversal guard only matters for the move being decided
+            if not moves:
+                value = 0.0
+                break
+            untried = [cell for cell in moves if cell not in node.children]
+            if untried:
+                cell = untried[int(self.rng.random() * len(untried))]
+                child = node.children[cell] = _Node()
+            else:
+                log_visits = math.log(node.visits)
+                cell = max(moves, key=lambda cell: (
+                    node.children[cell].value / node.children[cell].visits
+                    + exploration * math.sqrt(log_visits / node.children[cell].visits)))
+                child = node.children[cell]
+            depth += 1
+            if grow:
+                grow -= 1
+            else:
+                grid[tail] = 0
+                tail_i += 1
+            grid[cell] = 1
+            head_i += 1
+            body[head_i] = head = cell
+            node = child
+            path.append(node)
+            if cell == food:
+                value = self._outcome(head, body[tail_i], 1.0 - 0.5 * depth / horizon)
+                break
+            if depth >= horizon:
+                value = self._outcome(head, body[tail_i], self.SURVIVED)
+                break
+            if untried:
+                value = self._rollout(head, head_i, tail_i, grow, depth)
+                break
+        for node in path:
+            node.visits += 1
+            node.value += value
+
+    def _rollout(self, head, head_i, tail_i, grow, depth):
+        """Play random moves biased toward the food, returns the outcome's value"""
+        grid, body, neighbors = self._grid, self._body, self._neighbors
+        xs, ys, random = self._xs, self._ys, self.rng.random
+        food, horizon, greedy = self._food, self.horizon, self.GREEDY
+        fx, fy = xs[food], ys[food]
+        while depth < horizon:
+            tail = body[tail_i]
+            count = 0
+            choice = closest = -1
+            closest_distance = 1 << 30
+            for cell in neighbors[head]:
+                if grid[cell] and (cell != tail or grow):
+                    continue
+                count += 1
+                if random() * count < 1:  # Uniform pick without collecting the moves
+                    choice = cell
+                distance = abs(xs[cell] - fx) + abs(ys[cell] - fy)
+                if distance < closest_distance:
+                    closest, closest_distance = cell, distance
+            if not count:
+                return 0.0
+            cell = closest if random() < greedy else choice
+            depth += 1
+            if grow:
+                grow -= 1
+            else:
+                grid[tail] = 0
+                tail_i += 1
+            grid[cell] = 1
+            head_i += 1
+            body[head_i] = head = cell
+            if cell == food:
+                return self._outcome(head, body[tail_i], 1.0 - 0.5 * depth / horizon)
+        return self._outcome(head, body[tail_i], self.SURVIVED)
+
+    def _outcome(self, head, tail, value):
+        """value if the head can still reach the tail on the scratch grid, else TRAPPED"""
+        grid, seen, queue, neighbors = self._grid, self._seen, self._queue, self._neighbors
+        self._stamp += 1
+        if self._stamp >= 0xFFFFFFFF:
+            seen[:] = array('I', bytes(len(seen) * 4))
+            self._stamp = 1
+        stamp = self._stamp
+        seen[head] = stamp
+        queue[0] = head
+        read, write = 0, 1
+        while read < write:
+            cell = queue[read]
+            read += 1
+            for nb in neighbors[cell]:
+                if nb == tail and cell != head:  # A way round to the tail, not just next to it
+                    return value
+                if seen[nb] != stamp and not grid[nb]:
+                    seen[nb] = stamp
+                    queue[write] = nb
+                    write += 1
+        return self.TRAPPED
+
+
+_worker_planners = {}
+
+
+def _search_worker(cols, rows, walls, horizon, data, deadline, iterations, seed):
+    """Search a position in a worker process until the perf_counter() deadline
+
+    Returns (cell, visits, value) per root move and the time it finished.
+    """
+    from state import GameState
+    key = (cols, rows, walls, horizon)
+    cached = _worker_planners.get(key)
+    if cached is None:
+        cached = _worker_planners[key] = (LookaheadPlanner(cols, rows, walls=walls, horizon=horizon),
+                                          SnakeEngine(cols, rows, walls=walls))
+    planner, engine = cached
+    planner.rng.seed(seed)
+    GameState.from_buffer(data).restore(engine)
+    root = planner._search(engine, _Node(), float('inf') if deadline is None else deadline, iterations)
+    return [(cell, child.visits, child.value) for cell, child in root.children.items()], time.perf_counter()
+
+
+# Planners by the name the command line uses
+PLANNERS = {
+    'bfs': BFSPlanner,
+    'hamilton': HamiltonianPlanner,
+    'lookahead': LookaheadPlanner,
+}
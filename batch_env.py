@@ -0,0 +1,144 @@
+import numpy as np
+
+from engine import DIRECTIONS, FOOD_SCORE
+
+# Action indices follow engine.DIRECTIONS, -1 keeps the current heading
+KEEP = -1
+_DIRS = np.array(DIRECTIONS, dtype=np.int32)
+
+
+class BatchSnakeEnv:
+    """N independent snake games stepped in lockstep with NumPy
+
+    Follows the SnakeEngine rules. Bodies are ring buffers in a
+    preallocated (n, max_len, 2) array and an (n, rows, cols) occupancy
+    grid makes collision checks a single gather. Food lands uniformly on
+    free cells and a game that fills its board ends as done. Finished
+    games reset automatically at the end of the step that ended them.
+    """
+    def __init__(self, n, cols, rows, max_len=None, seed=None):
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.max_len = max_len or cols * rows
+        self.rng = np.random.default_rng(seed)
+
+        self.body = np.zeros((n, self.max_len, 2), dtype=np.int32)
+        self.grid = np.zeros((n, rows, cols), dtype=np.uint8)
+        self.head_idx = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.target = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros((n, 2), dtype=np.int32)
+        self.food = np.zeros((n, 2), dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+        # Score and length of the last finished game per env
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_length = np.zeros(n, dtype=np.int64)
+        self.episodes = 0
+        self._all = np.arange(n)
+        self.reset()
+
+    def reset(self, idx=None):
+        """Reset the given envs (all by default) to a fresh game"""
+        idx = self._all if idx is None else idx
+        cx, cy = self.cols // 2, self.rows // 2
+        self.grid[idx] = 0
+        self.grid[idx, cy, cx] = 1
+        self.body[idx, 0] = (cx, cy)
+        self.head_idx[idx] = 0
+        self.length[idx] = 1
+        self.target[idx] = 1
+        self.direction[idx] = 0
+        self.score[idx] = 0
+        self.ticks[idx] = 0
+        self.food[idx], _ = self._place_food(idx)
+
+    @property
+    def heads(self):
+        """Head positions as an (n, 2) array of (x, y)"""
+        return self.body[self._all, self.head_idx]
+
+    def step(self, actions):
+        """Advance every game one tick
+
+        actions is an int array of engine.DIRECTIONS indices (or KEEP).
+        Returns (rewards, dones); done games are already reset.
+        """
+        every = self._all
+        actions = np.asarray(actions)
+
+        # Turn, with the same reversal guard as SnakeEngine.turn
+        wanted = _DIRS[np.maximum(actions, 0)]
+        turn = (actions >= 0) & (
+            ((wanted[:, 0] != 0) & (self.direction[:, 0] == 0))
+            | ((wanted[:, 1] != 0) & (self.direction[:, 1] == 0))
+        )
+        self.direction[turn] = wanted[turn]
+
+        new = self.body[every, self.head_idx] + self.direction
+        nx, ny = new[:, 0], new[:, 1]
+        wall = (nx < 0) | (nx >= self.cols) | (ny < 0) | (ny >= self.rows)
+
+        # Drop tails first so the head may follow its own tail
+        popped = (self.length >= self.target) & ~wall
+        pop = np.flatnonzero(popped)
+        tail_idx = (self.head_idx[pop] - self.length[pop] + 1) % self.max_len
+        tail = self.body[pop, tail_idx]
+        self.grid[pop, tail[:, 1], tail[:, 0]] = 0
+        self.length[pop] -= 1
+
+        sx = np.clip(nx, 0, self.cols - 1)
+        sy = np.clip(ny, 0, self.rows - 1)
+        dead = wall | (self.grid[every, sy, sx] != 0)
+        live = np.flatnonzero(~dead)
+
+        head_idx = (self.head_idx[live] + 1) % self.max_len
+        self.head_idx[live] = head_idx
+        self.body[live, head_idx] = new[live]
+        self.grid[live, sy[live], sx[live]] = 1
+        self.length[live] += 1
+        self.ticks += 1
+
+        ate = ~dead & (nx == self.food[:, 0]) & (ny == self.food[:, 1])
+        rewards = ate * FOOD_SCORE
+        self.score += rewards
+        self.target[ate] = np.minimum(self.target[ate] + 1, self.max_len)
+        eaten = np.flatnonzero(ate)
+        if len(eaten):
+            self.food[eaten], full = self._place_food(eaten)
+            dead[eaten[full]] = True
+
+        self.done = dead
+        finished = np.flatnonzero(dead)
+        if len(finished):
+            self.final_score[finished] = self.score[finished]
+            self.final_length[finished] = self.length[finished] + popped[finished]
+            self.episodes += len(finished)
+            self.reset(finished)
+        return rewards, dead
+
+    def _place_food(self, idx):
+        """Food cells for envs idx, uniform over each board's free cells
+
+        One draw over the whole board is kept when it lands on a free
+        cell; only the rest pick again, all at once, by rank among their
+        free cells, which keeps the overall choice uniform. Returns
+        (cells, full) where full marks boards with no free cell left.
+        """
+        count = len(idx)
+        cells = np.empty((count, 2), dtype=np.int32)
+        cells[:, 0] = self.rng.integers(0, self.cols, count)
+        cells[:, 1] = self.rng.integers(0, self.rows, count)
+        full = np.zeros(count, dtype=bool)
+        taken = np.flatnonzero(self.grid[idx, cells[:, 1], cells[:, 0]])
+        if len(taken):
+            free = self.grid[idx[taken]].reshape(len(taken), -1) == 0
+            ranks = np.cumsum(free, axis=1)  # Free cells up to and including each cell
+            counts = ranks[:, -1]
+            pick = (self.rng.random(len(taken)) * counts).astype(np.int64)
+            cell = np.argmax(ranks > pick[:, None], axis=1)
+            cells[taken, 1], cells[taken, 0] = np.divmod(cell, self.cols)
+            full[taken] = counts == 0
+        return cells, full
@@ -0,0 +1,35 @@
+"""Microbenchmark: BatchSnakeEnv ticks per second versus batch size
+
+Run from the repository root:  python benchmarks/bench_batch.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch_env import BatchSnakeEnv
+
+STEPS = 200
+SIZES = (1, 64, 1024, 4096)
+
+
+def bench(n, cols=96, rows=54, steps=STEPS):
+    """Total game ticks per second with random actions"""
+    env = BatchSnakeEnv(n, cols, rows, seed=0)
+    actions = np.random.default_rng(0).integers(-1, 4, (steps, n))
+    start = time.perf_counter()
+    for row in actions:
+        env.step(row)
+    return n * steps / (time.perf_counter() - start)
+
+
+def main():
+    for n in SIZES:
+        print(f"{n:>5} envs: {bench(n):,.0f} ticks/sec")
+
+
+if __name__ == "__main__":
+    main()
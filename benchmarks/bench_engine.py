@@ -0,0 +1,82 @@
+"""Microbenchmark: headless SnakeEngine ticks per second
+
+Run from the repository root:  python benchmarks/bench_engine.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+
+TICKS = 1000000
+BOARDS = ((96, 54), (192, 108))
+LENGTHS = (1, 100, 1000, 10000)
+LENGTH_BOARD = (192, 108)
+
+
+def bench(cols, rows, ticks):
+    """Ticks per second for a snake circling in small squares"""
+    engine = SnakeEngine(cols, rows, seed=1)
+    pattern = (RIGHT, RIGHT, DOWN, DOWN, LEFT, LEFT, UP, UP)
+    start = time.perf_counter()
+    for i in range(ticks):
+        if not engine.step(pattern[i & 7]):
+            engine.reset()
+    return ticks / (time.perf_counter() - start)
+
+
+def serpentine_moves(cols, rows):
+    """Cells and directions of a boustrophedon walk over the board"""
+    cells, moves = [], []
+    for y in range(rows):
+        xs = range(cols) if y % 2 == 0 else range(cols - 1, -1, -1)
+        for x in xs:
+            if cells:
+                py, px = divmod(cells[-1], cols)
+                moves.append((x - px, y - py))
+            cells.append(y * cols + x)
+    return cells, moves
+
+
+def bench_length(length, ticks=100000, cols=LENGTH_BOARD[0], rows=LENGTH_BOARD[1]):
+    """Ticks per second for a snake of given length sweeping the board"""
+    engine = SnakeEngine(cols, rows, seed=1)
+    cells, moves = serpentine_moves(cols, rows)
+    engine.snake.clear()
+    for cell in cells[:length]:
+        engine.snake.move(cell, length)
+    engine.length = length
+    engine.dx, engine.dy = moves[length - 2] if length > 1 else RIGHT
+    ahead = moves[length - 1:length - 1 + ticks]
+    step = engine.step
+    start = time.perf_counter()
+    for move in ahead:
+        step(move)
+    elapsed = time.perf_counter() - start
+    if not engine.alive:
+        raise AssertionError("serpentine sweep should never collide")
+    return len(ahead) / elapsed
+
+
+def collect():
+    """Suite results: ticks/sec per board size and per snake length"""
+    results = {}
+    for cols, rows in BOARDS:
+        results[f"engine.ticks_per_sec.{cols}x{rows}"] = bench(cols, rows, TICKS // 4)
+    for length in LENGTHS:
+        results[f"engine.ticks_per_sec.length_{length}"] = bench_length(length)
+    return results
+
+
+def main():
+    for cols, rows in BOARDS:
+        rate = bench(cols, rows, TICKS)
+        print(f"{cols}x{rows}: {rate:,.0f} ticks/sec")
+    for length in LENGTHS:
+        print(f"length {length:>6}: {bench_length(length):,.0f} ticks/sec")
+
+
+if __name__ == "__main__":
+    main()
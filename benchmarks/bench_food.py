@@ -0,0 +1,47 @@
+"""Microbenchmark: food placement cost versus how full the board is
+
+Run from the repository root:  python benchmarks/bench_food.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import SnakeEngine
+
+BOARD = (192, 108)
+FILLS = (0.0, 0.5, 0.9, 0.99, 0.999)
+PLACEMENTS = 100000
+
+
+def bench(fill, placements=PLACEMENTS, cols=BOARD[0], rows=BOARD[1]):
+    """Average ns per food placement with fill of the board under the snake"""
+    engine = SnakeEngine(cols, rows, seed=1)
+    length = max(1, int(cols * rows * fill))
+    engine.snake.clear()
+    for cell in range(length):
+        engine.snake.move(cell, length)
+    place = engine._place_food
+    start = time.perf_counter()
+    for _ in range(placements):
+        food = place()
+    elapsed = time.perf_counter() - start
+    if food in engine.snake:
+        raise AssertionError("food placed on the snake")
+    return elapsed / placements * 1e9
+
+
+def collect():
+    """Suite results: ns per placement per fill ratio"""
+    return {f"food.place_ns.fill_{fill}": bench(fill) for fill in FILLS}
+
+
+def main():
+    print(f"{'fill':>6} {'ns/placement':>13}")
+    for fill in FILLS:
+        print(f"{fill:>6} {bench(fill):>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: autopilot planners compared by moves per food
+
+Run from the repository root:  python benchmarks/bench_planners.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autopilot import BFSPlanner, HamiltonianPlanner
+from engine import SnakeEngine
+
+BOARDS = ((16, 12), (32, 18))
+SEEDS = range(5)
+MAX_TICKS = 500000
+
+
+def play(planner_cls, cols, rows, seed, cache_dir):
+    """One game until death, a full board or MAX_TICKS"""
+    engine = SnakeEngine(cols, rows, seed=seed)
+    if planner_cls is HamiltonianPlanner:
+        planner = planner_cls(cols, rows, cache_dir=cache_dir)
+    else:
+        planner = planner_cls(cols, rows)
+    size = cols * rows
+    while engine.alive and engine.length < size and engine.ticks < MAX_TICKS:
+        engine.step(planner.decide(engine))
+    return engine.length - 1, engine.ticks, planner.stats.summary()
+
+
+def main():
+    cache_dir = tempfile.mkdtemp()
+    print(f"{'board':>7} {'planner':>9} {'foods':>7} {'moves/food':>11} {'p99 ms':>8} {'sec':>6}")
+    for cols, rows in BOARDS:
+        for planner_cls in (BFSPlanner, HamiltonianPlanner):
+            foods = ticks = 0
+            p99 = 0.0
+            start = time.perf_counter()
+            for seed in SEEDS:
+                eaten, moves, stats = play(planner_cls, cols, rows, seed, cache_dir)
+                foods += eaten
+                ticks += moves
+                p99 = max(p99, stats["p99_ms"])
+            elapsed = time.perf_counter() - start
+            print(f"{cols:>3}x{rows:<3} {planner_cls.name:>9} {foods / len(SEEDS):>7.1f} "
+                  f"{ticks / max(foods, 1):>11.1f} {p99:>8.3f} {elapsed:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: full snake draw, HUD and per-tick composite time versus length and resolution
+
+Runs headless on the SDL dummy video driver. Game files (scores,
+leaderboard, replays) go to a temporary directory.
+
+Run from the repository root:  python benchmarks/bench_render.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from game import SnakeGame
+
+RESOLUTIONS = {'1080p': (1920, 1080), '4k': (3840, 2160)}
+LENGTHS = (10, 100, 1000, 5000)
+REPEATS = 20
+
+
+def lay_snake(engine, length):
+    """Put a snake of given length on a serpentine through the board"""
+    cols, rows = engine.cols, engine.rows
+    cells = []
+    for y in range(rows):
+        xs = range(cols) if y % 2 == 0 else range(cols - 1, -1, -1)
+        cells.extend(y * cols + x for x in xs)
+    engine.snake.clear()
+    for cell in cells[:length]:
+        engine.snake.move(cell, length)
+    engine.length = length
+
+
+def bench(game, length, repeats=REPEATS):
+    """(draw_snake ms, hud ms, tick composite ms) averaged over repeats"""
+    lay_snake(game.engine, length)
+    snake = game.engine.snake
+    start = time.perf_counter()
+    for _ in range(repeats):
+        game._painted = bytearray(game.cols * game.rows)
+        game._draw_snake(snake)
+    draw = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        game._draw_score(length * repeats + i)  # New text each time, as after eating
+        game._draw_high_scores()
+        game._draw_controls()
+    hud = (time.perf_counter() - start) / repeats
+
+    # What a tick after eating pushes: head and food cells plus the score
+    game._painted_food = game.engine.food
+    game.compositor.composite()
+    start = time.perf_counter()
+    for i in range(repeats):
+        game._repaint_rect(game._cell_rect(snake.head))
+        game._repaint_rect(game._food_rect(game.engine.food))
+        game._draw_score(i)
+        game.compositor.composite()
+    tick = (time.perf_counter() - start) / repeats
+    return draw * 1000, hud * 1000, tick * 1000
+
+
+def collect():
+    """Suite results per resolution and length"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, size in RESOLUTIONS.items():
+            game = SnakeGame(size=size, data_dir=tmp)
+            for length in LENGTHS:
+                draw, hud, tick = bench(game, length)
+                results[f"render.draw_snake_ms.{name}.length_{length}"] = draw
+                results[f"render.hud_ms.{name}.length_{length}"] = hud
+                results[f"render.tick_ms.{name}.length_{length}"] = tick
+    return results
+
+
+def main():
+    results = collect()
+    print(f"{'resolution':>10} {'length':>7} {'snake ms':>9} {'hud ms':>7} {'tick ms':>8}")
+    for name in RESOLUTIONS:
+        for length in LENGTHS:
+            draw = results[f"render.draw_snake_ms.{name}.length_{length}"]
+            hud = results[f"render.hud_ms.{name}.length_{length}"]
+            tick = results[f"render.tick_ms.{name}.length_{length}"]
+            print(f"{name:>10} {length:>7} {draw:>9.3f} {hud:>7.3f} {tick:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
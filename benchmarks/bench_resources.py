@@ -0,0 +1,69 @@
+"""Benchmark: icon and font load time from loose files versus the resource bundle
+
+Each load starts from a fresh Resources, so bundle times include mapping
+the file and reading its index, as on a cold start. Fonts are pygame's
+own default font, packed under the names the game asks for.
+
+Run from the repository root:  python benchmarks/bench_resources.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+
+from resources import FONTS, Resources, build
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_SIZES = (24, 36, 72)
+REPEATS = 20
+
+
+def bench(repeats=REPEATS):
+    """{source: (icon ms, fonts ms)} for loose files and the bundle"""
+    pygame.font.init()
+    font_file = pygame.font.get_default_font()
+    font_file = os.path.join(os.path.dirname(pygame.__file__), font_file)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        build(os.path.join(tmp, 'hebi.pak'), os.path.join(ROOT, 'icon.png'),
+              font_files={key: font_file for key in FONTS})
+        for source, dirs in (('loose', [ROOT]), ('bundle', [tmp])):
+            icon = fonts = 0.0
+            for _ in range(repeats):
+                resources = Resources(tmp, dirs=dirs)
+                start = time.perf_counter()
+                resources.icon('icon.png')
+                icon += time.perf_counter() - start
+
+                start = time.perf_counter()
+                for name, bold in FONTS:
+                    for size in FONT_SIZES:
+                        bundled = resources.font(name, bold)
+                        pygame.font.Font(bundled[0] if bundled else font_file, size)
+                fonts += time.perf_counter() - start
+            results[source] = (icon / repeats * 1000, fonts / repeats * 1000)
+    return results
+
+
+def collect():
+    """Suite results per source"""
+    results = {}
+    for source, (icon, fonts) in bench().items():
+        results[f"resources.icon_ms.{source}"] = icon
+        results[f"resources.fonts_ms.{source}"] = fonts
+    return results
+
+
+def main():
+    print(f"{'source':>7} {'icon ms':>8} {'fonts ms':>9}")
+    for source, (icon, fonts) in bench().items():
+        print(f"{source:>7} {icon:>8.3f} {fonts:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
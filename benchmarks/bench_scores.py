@@ -0,0 +1,66 @@
+"""Microbenchmark: high score load, add and check latency versus table size
+
+Run from the repository root:  python benchmarks/bench_scores.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scores import HighScoreManager
+
+SIZES = (10, 100, 1000, 10000)
+ADDS = 50
+CHECKS = 100000
+
+
+def bench(size, adds=ADDS, checks=CHECKS):
+    """(load ms, add ms, is_high_score ns) for a table of size entries and as many log lines"""
+    rng = random.Random(size)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scores.json')
+        # Build the log directly, adding one by one would compact along the way
+        with open(path, 'w') as f:
+            for i in range(size):
+                f.write(f'{{"name": "p{i % 50}", "score": {rng.randrange(100000)}}}\n')
+
+        start = time.perf_counter()
+        table = HighScoreManager(path, size)
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(adds):
+            table.add_score("bench", rng.randrange(100000))
+        add = (time.perf_counter() - start) / adds
+
+        is_high_score = table.is_high_score
+        start = time.perf_counter()
+        for score in range(checks):
+            is_high_score(score)
+        check = (time.perf_counter() - start) / checks
+    return load * 1000, add * 1000, check * 1e9
+
+
+def collect():
+    """Suite results per table size"""
+    results = {}
+    for size in SIZES:
+        load, add, check = bench(size)
+        results[f"scores.load_ms.size_{size}"] = load
+        results[f"scores.add_ms.size_{size}"] = add
+        results[f"scores.is_high_score_ns.size_{size}"] = check
+    return results
+
+
+def main():
+    print(f"{'size':>6} {'load ms':>9} {'add ms':>8} {'check ns':>9}")
+    for size in SIZES:
+        load, add, check = bench(size)
+        print(f"{size:>6} {load:>9.2f} {add:>8.3f} {check:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Microbenchmark: per-tick cost of the snake body versus its length
+
+Run from the repository root:  python benchmarks/bench_snake.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Snake
+
+COLS = ROWS = 512
+LENGTHS = (10, 100, 1000, 10000, 100000)
+TICKS = 100000
+
+
+def serpentine(cols, rows):
+    """Boustrophedon path visiting every cell once"""
+    path = []
+    for y in range(rows):
+        xs = range(cols) if y % 2 == 0 else range(cols - 1, -1, -1)
+        path.extend(y * cols + x for x in xs)
+    return path
+
+
+def bench_snake(length, path, ticks):
+    """Average ns per move + collision check for a snake of given length"""
+    snake = Snake(COLS, ROWS)
+    for cell in path[:length]:
+        snake.move(cell, length)
+    ahead = path[length:length + ticks]
+    start = time.perf_counter()
+    for cell in ahead:
+        if snake.collides(cell, length):
+            raise AssertionError("serpentine path should never collide")
+        snake.move(cell, length)
+    return (time.perf_counter() - start) / len(ahead) * 1e9
+
+
+def bench_list(length, path, ticks):
+    """Same workload with the old list-of-lists body for comparison"""
+    snake_list = [[cell % COLS, cell // COLS] for cell in path[:length]]
+    ahead = path[length:length + ticks]
+    start = time.perf_counter()
+    for cell in ahead:
+        snake_head = [cell % COLS, cell // COLS]
+        snake_list.append(snake_head)
+        if len(snake_list) > length:
+            del snake_list[0]
+        for x in snake_list[:-1]:
+            if x == snake_head:
+                raise AssertionError("serpentine path should never collide")
+    return (time.perf_counter() - start) / len(ahead) * 1e9
+
+
+def main():
+    path = serpentine(COLS, ROWS)
+    print(f"{'length':>8} {'Snake ns/tick':>14} {'list ns/tick':>14}")
+    for length in LENGTHS:
+        fast = bench_snake(length, path, TICKS)
+        # The list model is O(length) per tick, keep its run short
+        slow = bench_list(length, path, max(10, TICKS // length))
+        print(f"{length:>8} {fast:>14.0f} {slow:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark suite: run every collector, write JSON, compare to a baseline
+
+Run from the repository root:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json
+
+Metric names end in their unit. *_per_sec metrics are better when
+higher, everything else (ms, ns) when lower. Comparing against a
+baseline exits with status 1 if any metric regressed past the
+threshold. Runs headless: rendering uses the SDL dummy video driver.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import bench_engine
+import bench_food
+import bench_render
+import bench_resources
+import bench_scores
+
+SUITES = {
+    'engine': bench_engine,
+    'food': bench_food,
+    'render': bench_render,
+    'resources': bench_resources,
+    'scores': bench_scores,
+}
+
+
+def run(names):
+    """Results of the named suites plus environment metadata"""
+    import pygame
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        results.update(SUITES[name].collect())
+        print(f"{name}: {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def higher_is_better(metric):
+    return "_per_sec" in metric
+
+
+def compare(current, baseline, threshold):
+    """Print the change of every shared metric, returns the regressed names"""
+    regressed = []
+    print(f"{'metric':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for metric, value in current.items():
+        if metric not in baseline:
+            continue
+        base = baseline[metric]
+        change = (value - base) / base if base else 0.0
+        worse = -change if higher_is_better(metric) else change
+        flag = ""
+        if worse > threshold:
+            regressed.append(metric)
+            flag = "  REGRESSED"
+        print(f"{metric:<48} {base:>12.4g} {value:>12.4g} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hebi benchmark suite")
+    parser.add_argument('suites', nargs='*', metavar='SUITE',
+                        help=f"suites to run: {', '.join(sorted(SUITES))} (default: all)")
+    parser.add_argument('--output', metavar='FILE', help="write results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="compare against saved results")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    report = run(args.suites or sorted(SUITES))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif not args.baseline:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressed = compare(report["results"], baseline, args.threshold)
+        if regressed:
+            print(f"{len(regressed)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import os
+import queue
+import struct
+import threading
+import time
+from collections import deque
+
+from autopilot import LatencyStats
+from engine import DIRECTIONS
+from state import GameState
+
+# Controller protocol. Clients send single bytes: 0-3 turn toward
+# engine.DIRECTIONS[code], STATE asks for the whole game. The game sends
+# frames starting with a type byte: TICK after every tick, GAME_OVER when
+# a game ends and STATE_REPLY with a length-prefixed GameState.pack().
+STATE = 4
+TICK = b'T'
+GAME_OVER = b'O'
+STATE_REPLY = b'S'
+_TICK = struct.Struct('<Iiii')  # ticks, head cell, food cell (-1 for none), score
+_GAME_OVER = struct.Struct('<i')  # score
+_LENGTH = struct.Struct('<I')
+
+# A client that lets this much output pile up unread is dropped
+_MAX_BACKLOG = 1 << 20
+
+
+class TurnQueue:
+    """Turns buffered for the coming ticks, oldest first
+
+    Up to size turns wait, so several presses within one tick take effect
+    on consecutive ticks instead of overwriting each other. A turn is only
+    queued if the engine's reversal guard will accept it after the ones
+    already queued. Turns keep the time they arrived and pop() records
+    how long each waited in latency.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.latency = LatencyStats()
+        self._turns = deque()
+
+    def __len__(self):
+        return len(self._turns)
+
+    def push(self, direction, heading, stamp=None):
+        """Queue a turn given the current heading; False if it was dropped"""
+        if len(self._turns) >= self.size:
+            return False
+        last = self._turns[-1][1] if self._turns else heading
+        # Same reversal guard as the engine, checked against the last queued turn
+        if (direction[0] and last[0] == 0) or (direction[1] and last[1] == 0):
+            self._turns.append((time.perf_counter() if stamp is None else stamp, direction))
+            return True
+        return False
+
+    def pop(self):
+        """Oldest queued turn, or None"""
+        if not self._turns:
+            return None
+        stamp, direction = self._turns.popleft()
+        self.latency.record(time.perf_counter() - stamp)
+        return direction
+
+    def clear(self):
+        self._turns.clear()
+
+
+class InputSource:
+    """Somewhere turns come from besides the keyboard
+
+    The game polls every source once per frame and tells them about
+    ticks and game overs. Everything runs on the game thread. While
+    something steers through a source it is active, and the game counts
+    as played by it rather than by a human.
+    """
+    name = None
+    active = False
+
+    def poll(self, engine):
+        """(arrival time, direction) turns received since the last poll"""
+        return ()
+
+    def tick(self, engine):
+        """Called after every engine step"""
+
+    def game_over(self, engine):
+        """Called once when a game ends"""
+
+    def close(self):
+        """Release whatever the source holds"""
+
+
+def parse_address(address):
+    """'unix:PATH', 'tcp:HOST:PORT' or a bare port -> (family, target)"""
+    if address.startswith('unix:'):
+        return 'unix', address[5:]
+    if address.startswith('tcp:'):
+        address = address[4:]
+    host, _, port = address.rpartition(':')
+    port = int(port)
+    if not 0 <= port <= 65535:
+        raise ValueError(f"port must be 0-65535, not {port}")
+    return 'tcp', (host or '127.0.0.1', port)
+
+
+class SocketController(InputSource):
+    """External controllers on a local Unix or TCP socket
+
+    An asyncio server runs on a daemon thread. Bytes received are stamped
+    and handed to the game thread through a lock-free queue, so the game
+    loop never waits on the network. Replies and tick frames are written
+    by the server thread. State requests are answered from poll(), on
+    the game thread, where the engine can be read safely. asyncio and
+    socket are imported only when a controller is created, so importing
+    this module costs nothing extra.
+    """
+    name = 'socket'
+
+    def __init__(self, address):
+        import asyncio
+        self.address = address
+        self.family, self.target = parse_address(address)
+        self._incoming = queue.SimpleQueue()
+        self._clients = set()
+        self._tasks = set()
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._error = None
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(started,), daemon=True,
+                                        name="hebi-controller")
+        self._thread.start()
+        started.wait()
+        if self._error:
+            raise self._error
+
+    def _serve(self, started):
+        import asyncio
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(self._start())
+        except Exception as e:  # Handed to __init__, which must never be left waiting
+            self._error = e
+            self._loop.close()
+            return
+        finally:
+            started.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _shutdown(self):
+        import asyncio
+        self._server.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._loop.stop()
+
+    async def _start(self):
+        import asyncio
+        if self.family == 'unix':
+            if not hasattr(asyncio, 'start_unix_server'):
+                raise OSError("unix sockets are not available on this platform")
+            if os.path.exists(self.target):
+                os.remove(self.target)  # Left behind by a session that crashed
+            return await asyncio.start_unix_server(self._handle, self.target)
+        return await asyncio.start_server(self._handle, *self.target)
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        import socket
+        sock = writer.get_extra_info('socket')
+        if self.family == 'tcp' and sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._clients.add(writer)
+        self.active = True  # A client is connected, the game is driven from outside
+        self._tasks.add(asyncio.current_task())
+        try:
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+                now = time.perf_counter()
+                for code in data:
+                    self._incoming.put((now, code, writer))
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._tasks.discard(asyncio.current_task())
+            self._clients.discard(writer)
+            self.active = bool(self._clients)  # Back to the keyboard once every client left
+            writer.close()
+
+    def poll(self, engine):
+        turns = []
+        while True:
+            try:
+                stamp, code, writer = self._incoming.get_nowait()
+            except queue.Empty:
+                return turns
+            if code < len(DIRECTIONS):
+                turns.append((stamp, DIRECTIONS[code]))
+            elif code == STATE:
+                data = GameState.capture(engine).pack()
+                frame = STATE_REPLY + _LENGTH.pack(len(data)) + data
+                self._loop.call_soon_threadsafe(self._write, writer, frame)
+
+    def tick(self, engine):
+        if self._clients:
+            food = -1 if engine.food is None else engine.food
+            self._broadcast(TICK + _TICK.pack(engine.ticks, engine.snake.head, food, engine.score))
+
+    def game_over(self, engine):
+        if self._clients:
+            self._broadcast(GAME_OVER + _GAME_OVER.pack(engine.score))
+
+    def _broadcast(self, frame):
+        self._loop.call_soon_threadsafe(self._write_all, frame)
+
+    def _write_all(self, frame):
+        for writer in list(self._clients):
+            self._write(writer, frame)
+
+    def _write(self, writer, data):
+        """Runs on the server thread"""
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > _MAX_BACKLOG:
+            writer.close()
+            return
+        writer.write(data)
+
+    def close(self):
+        if self._server is None:
+            return
+        import asyncio
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        self._thread.join(timeout=1)
+        self._server = None
+        if self.family == 'unix':
+            try:
+                os.remove(self.target)
+            except OSError:
+                pass
+
+
+class ControllerClient:
+    """Blocking client for bots driving a game through a SocketController"""
+    def __init__(self, address):
+        import socket
+        family, target = parse_address(address)
+        if family == 'unix':
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.connect(target)
+        self._file = self.sock.makefile('rb')
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+    def turn(self, direction):
+        """Ask for a turn toward one of engine.DIRECTIONS"""
+        self.sock.sendall(bytes((DIRECTIONS.index(direction),)))
+
+    def request_state(self):
+        """Ask for the whole game; the reply arrives among the frames"""
+        self.sock.sendall(bytes((STATE,)))
+
+    def read_frame(self):
+        """Next frame from the game as (kind, payload), or None once it closed
+
+        TICK payloads are (ticks, head, food, score), GAME_OVER ones the
+        score and STATE_REPLY ones a GameState.
+        """
+        kind = self._file.read(1)
+        if not kind:
+            return None
+        if kind == TICK:
+            return kind, _TICK.unpack(self._file.read(_TICK.size))
+        if kind == GAME_OVER:
+            return kind, _GAME_OVER.unpack(self._file.read(_GAME_OVER.size))[0]
+        if kind == STATE_REPLY:
+            length, = _LENGTH.unpack(self._file.read(_LENGTH.size))
+            return kind, GameState.unpack(self._file.read(length))
+        raise ValueError(f"unknown frame type {kind!r}")
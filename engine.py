@@ -0,0 +1,303 @@
+import random
+from array import array
+from collections import deque
+
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+FOOD_SCORE = 10
+
+# Occupancy grid values
+SEGMENT = 1
+WALL = 2
+
+
+class FreeCells:
+    """Index of empty cells with O(1) add, remove and uniform sampling
+
+    cells[:size] holds the free cells in arbitrary order and index maps
+    each cell to its slot. Removing swaps the cell with the last free
+    one, adding swaps it back in, so nothing is ever scanned.
+    """
+    __slots__ = ('cells', 'index', 'size')
+
+    def __init__(self, count):
+        self.cells = array('i', range(count))
+        self.index = array('i', range(count))
+        self.size = count
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, cell):
+        return self.index[cell] < self.size
+
+    def remove(self, cell):
+        """Mark a cell as taken"""
+        cells, index = self.cells, self.index
+        slot = index[cell]
+        self.size -= 1
+        last = cells[self.size]
+        cells[slot], cells[self.size] = last, cell
+        index[last], index[cell] = slot, self.size
+
+    def add(self, cell):
+        """Mark a cell as free again"""
+        cells, index = self.cells, self.index
+        slot = index[cell]
+        first = cells[self.size]
+        cells[slot], cells[self.size] = first, cell
+        index[first], index[cell] = slot, self.size
+        self.size += 1
+
+    def copy(self):
+        """Independent index with the same cells in the same slots"""
+        clone = FreeCells.__new__(FreeCells)
+        clone.cells = self.cells[:]
+        clone.index = self.index[:]
+        clone.size = self.size
+        return clone
+
+    def sample(self, rng):
+        """Uniformly random free cell, or None if the board is full"""
+        if not self.size:
+            return None
+        return self.cells[rng.randrange(self.size)]
+
+
+class Snake:
+    """Snake body: deque of packed cells plus an occupancy grid
+
+    Cells are packed as ``y * cols + x`` so moving, growing, dropping the
+    tail and checking self collision are all O(1) whatever the length.
+    Wall cells are marked in the grid too, so anything that treats
+    occupied cells as blocked also steers around them.
+    """
+    __slots__ = ('cols', 'rows', 'body', 'grid', 'free')
+
+    def __init__(self, cols, rows, walls=()):
+        self.cols = cols
+        self.rows = rows
+        self.body = deque()
+        self.grid = bytearray(cols * rows)
+        self.free = FreeCells(cols * rows)
+        for cell in walls:
+            self.grid[cell] = WALL
+            self.free.remove(cell)
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        """Iterate cells from tail to head"""
+        return iter(self.body)
+
+    def __contains__(self, cell):
+        return self.grid[cell] == SEGMENT
+
+    @property
+    def head(self):
+        return self.body[-1]
+
+    @property
+    def tail(self):
+        return self.body[0]
+
+    def pack(self, x, y):
+        """Pack cell coordinates into a single int"""
+        return y * self.cols + x
+
+    def unpack(self, cell):
+        """Unpack a cell into (x, y) coordinates"""
+        y, x = divmod(cell, self.cols)
+        return x, y
+
+    def coords(self):
+        """Yield (x, y) cell coordinates from tail to head"""
+        cols = self.cols
+        for cell in self.body:
+            y, x = divmod(cell, cols)
+            yield x, y
+
+    def collides(self, cell, length):
+        """Check if moving the head to cell would bite the body"""
+        if not self.grid[cell]:
+            return False
+        # The tail moves out of the way unless the snake is growing
+        return not (len(self.body) >= length and self.body[0] == cell)
+
+    def move(self, cell, length):
+        """Push a new head keeping at most length segments
+
+        Returns the vacated tail cell, or None if the snake grew.
+        """
+        body, grid, free = self.body, self.grid, self.free
+        cells, index = free.cells, free.index
+        vacated = None
+        if len(body) >= length:
+            vacated = body.popleft()
+            grid[vacated] = 0
+            if vacated != cell:
+                # Head and tail swap slots, the free index keeps its size
+                free_slot, taken_slot = index[cell], index[vacated]
+                cells[free_slot], cells[taken_slot] = vacated, cell
+                index[vacated], index[cell] = free_slot, taken_slot
+            body.append(cell)
+            grid[cell] = SEGMENT
+            return vacated
+        body.append(cell)
+        grid[cell] = SEGMENT
+        free.remove(cell)
+        return vacated
+
+    def copy(self):
+        """Independent snake on a copy of the grid"""
+        clone = Snake.__new__(Snake)
+        clone.cols = self.cols
+        clone.rows = self.rows
+        clone.body = deque(self.body)
+        clone.grid = self.grid[:]
+        clone.free = self.free.copy()
+        return clone
+
+    def clear(self):
+        """Remove every segment"""
+        grid, free = self.grid, self.free
+        for cell in self.body:
+            grid[cell] = 0
+            free.add(cell)
+        self.body.clear()
+
+
+class SnakeEngine:
+    """Pure-Python game rules with no pygame dependency
+
+    Works on a cols x rows cell board: movement, wall and self collision,
+    food, scoring, growth and the reversal guard. Call step() once per tick.
+    Food only ever spawns on free cells; filling the board ends the game
+    with death set to 'won'. walls are packed cells inside the board that
+    kill like its edges, e.g. the gaps between monitors.
+    """
+    __slots__ = ('cols', 'rows', 'rng', 'snake', 'walls', 'start', 'dx', 'dy', 'length',
+                 'score', 'food', 'alive', 'death', 'ticks', 'vacated', 'ate')
+
+    def __init__(self, cols, rows, seed=None, walls=()):
+        self.cols = cols
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.walls = tuple(walls)
+        self.snake = Snake(cols, rows, self.walls)
+        self.start = self._start_cell()
+        self.reset()
+
+    def _start_cell(self):
+        """Center of the board, or the open cell nearest to it"""
+        cx, cy = self.cols // 2, self.rows // 2
+        grid = self.snake.grid
+        if not grid[cy * self.cols + cx]:
+            return cy * self.cols + cx
+        return min((cell for cell in range(len(grid)) if not grid[cell]),
+                   key=lambda cell: abs(cell % self.cols - cx) + abs(cell // self.cols - cy))
+
+    def reset(self):
+        """Start a new game with a one-segment snake in the center"""
+        self.snake.clear()
+        self.snake.move(self.start, 1)
+        self.dx = self.dy = 0
+        self.length = 1
+        self.score = 0
+        self.alive = True
+        self.death = None
+        self.ticks = 0
+        self.vacated = None
+        self.ate = False
+        self.food = self._place_food()
+
+    def copy(self, rng=None):
+        """Independent engine in the same state
+
+        By default the copy gets a clone of the food generator and steps
+        exactly like the original would. Cloning the generator is most of
+        the cost, so searches that don't need the real food sequence can
+        pass an rng of their own instead; the rest is the body plus a
+        memcpy of the board arrays.
+        """
+        clone = SnakeEngine.__new__(SnakeEngine)
+        for name in ('cols', 'rows', 'walls', 'start', 'dx', 'dy', 'length', 'score',
+                     'food', 'alive', 'death', 'ticks', 'vacated', 'ate'):
+            setattr(clone, name, getattr(self, name))
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        clone.rng = rng
+        clone.snake = self.snake.copy()
+        return clone
+
+    @property
+    def head(self):
+        """Head position as (x, y) cell coordinates"""
+        return self.snake.unpack(self.snake.head)
+
+    @property
+    def direction(self):
+        return self.dx, self.dy
+
+    def turn(self, direction):
+        """Change direction unless it would reverse onto the body
+
+        Returns True if the turn was accepted.
+        """
+        dx, dy = direction
+        if (dx and self.dx == 0) or (dy and self.dy == 0):
+            self.dx, self.dy = dx, dy
+            return True
+        return False
+
+    def step(self, action=None):
+        """Advance one tick, optionally turning first
+
+        Returns True while the game is still running. After a step,
+        vacated holds the freed tail cell (or None) and ate tells whether
+        food was eaten.
+        """
+        if not self.alive:
+            return False
+        if action is not None:
+            self.turn(action)
+        self.ticks += 1
+        self.vacated = None
+        self.ate = False
+
+        snake = self.snake
+        x, y = snake.unpack(snake.head)
+        x += self.dx
+        y += self.dy
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            self.alive = False
+            self.death = 'wall'
+            return False
+
+        cell = y * self.cols + x
+        if snake.collides(cell, self.length):
+            self.alive = False
+            self.death = 'wall' if snake.grid[cell] == WALL else 'self'
+            return False
+        self.vacated = snake.move(cell, self.length)
+
+        if cell == self.food:
+            self.ate = True
+            self.length += 1
+            self.score += FOOD_SCORE
+            self.food = self._place_food()
+            if self.food is None:
+                self.alive = False
+                self.death = 'won'
+                return False
+        return True
+
+    def _place_food(self):
+        """Uniformly random free cell for the next food"""
+        return self.snake.free.sample(self.rng)
@@ -1,13 +1,46 @@
-import random
+import time
+_IMPORT_START = time.perf_counter()
 import sys
 import os
-import json
-from screeninfo import get_monitors
+import argparse
+import random
+import sqlite3
+from bisect import bisect_left, bisect_right
+from collections import deque
 import pygame
-import win32api
-import win32con
-import win32gui
-from pygame import gfxdraw
+from engine import SnakeEngine, UP, DOWN, LEFT, RIGHT
+from render import TextCache, SpriteAtlas, OverlayManager, FontLoader, Compositor
+from window import BACKENDS, get_backend, desktop_size, monitor_rects
+from autopilot import PLANNERS, LatencyStats
+from replay import ReplayWriter, ReplayReader, ReplayPlayer, verify
+from state import suspend, resume
+from controls import TurnQueue
+from resources import Resources
+from scores import HighScoreManager, Leaderboard
+from profiler import FrameProfiler
+
+class StartupTimer:
+    """Wall-clock phases from the first import to the first frame on screen"""
+    def __init__(self, start):
+        self.start = self.last = start
+        self.phases = []
+        self.done = False
+    
+    def mark(self, phase):
+        """End the current phase"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last, now - self.start))
+        self.last = now
+    
+    def report(self, file=None):
+        """Print the phases in the layout of python -X importtime"""
+        file = file or sys.stderr
+        print("startup: self [ms] | cumulative | phase", file=file)
+        for phase, own, total in self.phases:
+            print(f"startup: {own * 1000:9.1f} | {total * 1000:10.1f} | {phase}", file=file)
+
+STARTUP = StartupTimer(_IMPORT_START)
+STARTUP.mark("imports")
 
 class Colors:
     """Container for color constants"""
@@ -26,259 +59,845 @@ class GameSettings:
         self.snake_block = 20
         self.snake_speed = 15
         self.high_score_file = "snake_scores.json"
+        self.high_score_count = 10
+        self.leaderboard_file = "hebi_games.db"
         self.icon_path = 'icon.png'
         self.caption = "Hebi"
+        self.incremental_render = True
+        self.tile_size = 64  # Side of the screen tiles the compositor rebuilds
+        self.autopilot = None
+        self.autopilot_workers = 0  # Extra processes a lookahead autopilot searches in
+        self.autopilot_budget = 0.5  # Share of a tick the planner may use, of a frame if it ponders
+        self.smooth_motion = True
+        self.max_fps = 0  # 0 follows the display refresh rate
+        self.turn_queue = 3  # Turns buffered ahead of the ticks that apply them
+        self.controller = None  # Socket address external controllers connect to, see controls.py
+        self.report_stats = False
+        self.gradient_levels = 32
+        self.window_backend = None  # See window.BACKENDS, None picks one for the platform
+        self.span_monitors = False
+        self.window_size = None  # (width, height), None covers the primary monitor
+        self.profile = False
+        self.profile_file = None  # .csv or .json trace written on quit
+        self.seed = None  # Food placement seed, None for a fresh game each run
+        self.replay_dir = "replays"
+        self.record_replays = True
+        self.suspend_file = "hebi_suspend.bin"  # Game in progress at quit, resumed on start
 
 class SnakeGame:
-    """Main game class"""
-    def __init__(self):
+    """Main game class, renders a SnakeEngine on a transparent window"""
+    KEY_DIRECTIONS = {
+        pygame.K_UP: UP,
+        pygame.K_DOWN: DOWN,
+        pygame.K_LEFT: LEFT,
+        pygame.K_RIGHT: RIGHT,
+    }
+    
+    AUTOPILOTS = PLANNERS
+    
+    # Longest frame fed to the logic accumulator, avoids catch-up bursts
+    MAX_FRAME_MS = 250
+    
+    def __init__(self, autopilot=None, report_stats=False, seed=None, replay=None, backend=None,
+                 span=False, profile=False, profile_file=None, size=None, controller=None,
+                 data_dir=None, workers=0):
+        self.startup = STARTUP
         self.settings = GameSettings()
+        self.resources = Resources(data_dir)
+        self.settings.autopilot = autopilot
+        self.settings.autopilot_workers = workers
+        self.settings.report_stats = report_stats
+        self.settings.seed = seed
+        self.settings.window_backend = backend
+        self.settings.span_monitors = span
+        self.settings.window_size = size
+        self.settings.controller = controller
+        self.settings.profile = profile or bool(profile_file)
+        self.settings.profile_file = profile_file
+        self.replay = None
+        if replay:
+            # Play back on the recorded board with the recorded settings
+            reader = ReplayReader(replay)
+            self.replay = ReplayPlayer(reader)
+            self.settings.autopilot = None
+            self.settings.record_replays = False
+            self.settings.seed = reader.seed
+            self.settings.snake_block = reader.snake_block
+            self.settings.snake_speed = reader.snake_speed
+        elif self.settings.seed is None:
+            self.settings.seed = random.getrandbits(63)
         self.colors = Colors()
         self._initialize_pygame()
+        self.startup.mark("display init")
         self._setup_window()
-        self._load_fonts()
-        self.high_score_manager = HighScoreManager(self.settings.high_score_file)
+        self.startup.mark("window")
+        if self.replay:
+            self.cols, self.rows = self.replay.reader.cols, self.replay.reader.rows
+            self.walls = self.replay.reader.walls
+        self.fonts = FontLoader(resources=self.resources)
+        self.engine = SnakeEngine(self.cols, self.rows, seed=self.settings.seed, walls=self.walls)
+        self.resumed = None if self.replay else self._resume()
+        self.recorder = None
+        self.frame_rate = self._frame_rate()
+        self.autopilot = self._create_autopilot()
+        self.text_cache = TextCache()
+        self.high_score_manager = HighScoreManager(self.resources.data_path(self.settings.high_score_file),
+                                                   self.settings.high_score_count)
+        self.leaderboard = self._open_leaderboard()
+        self.leaderboard.import_scores(self.high_score_manager.scores)
         self.clock = pygame.time.Clock()
+        self._level_colors = self._build_level_colors()
+        self.sprites = self._build_sprites(self.settings.snake_block)
+        self.overlays = self._build_overlays()
+        self._full_redraw = True
+        self.turns = TurnQueue(self.settings.turn_queue)
+        self.inputs = self._create_inputs()
+        self._motion = None
+        self._alpha = 0.0
+        self._accumulator = 0
+        self.frame_stats = LatencyStats(budget=1 / self.frame_rate)
+        self.idle_wall = 0.0
+        self.idle_cpu = 0.0
+        self.profiler = self._create_profiler()
+        self._profile_overlay = None
+        self.startup.mark("game state")
         
     def _initialize_pygame(self):
-        """Initialize pygame and set basic properties"""
-        pygame.init()
+        """Initialize the display and font subsystems only, no audio or joysticks"""
+        # Transparency is platform specific, see window.py
+        self.window_backend = get_backend(self.settings.window_backend)
+        self.window_backend.prepare()
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption(self.settings.caption)
-        if os.path.exists(self.settings.icon_path):
-            icon_image = pygame.image.load(self.settings.icon_path)
-            pygame.display.set_icon(icon_image)
+        icon = self.resources.icon(self.settings.icon_path)
+        if icon:
+            pygame.display.set_icon(icon)
         
     def _setup_window(self):
-        """Create and configure the game window"""
-        first_monitor = get_monitors()[0]
-        self.width, self.height = first_monitor.width, first_monitor.height
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.NOFRAME)
-        
-        # Windows-specific transparency settings
-        hwnd = pygame.display.get_wm_info()["window"]
-        win32gui.SetWindowLong(
-            hwnd,
-            win32con.GWL_EXSTYLE,
-            win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) | win32con.WS_EX_LAYERED
-        )
-        win32gui.SetLayeredWindowAttributes(
-            hwnd, win32api.RGB(*self.colors.FUCHSIA), 0, win32con.LWA_COLORKEY
-        )
-        win32gui.SetWindowPos(
-            hwnd, win32con.HWND_TOPMOST, 0, 0, self.width, self.height, 0
-        )
-    
-    def _load_fonts(self):
-        """Initialize game fonts"""
-        self.font_small = pygame.font.SysFont('Arial', 24)
-        self.font_medium = pygame.font.SysFont('Arial', 36)
-        self.font_large = pygame.font.SysFont('Arial', 72, bold=True)
+        """Create and configure the game window, over every monitor when spanning
+        
+        One window covers the bounding box of the monitors. Cells that are
+        not wholly on screen become walls, the HUD and modal screens
+        stay on the primary monitor (the view) and width/height are its size.
+        """
+        if self.settings.span_monitors:
+            monitors = [pygame.Rect(rect) for rect in monitor_rects()]
+            desktop = monitors[0].unionall(monitors[1:])
+            os.environ['SDL_VIDEO_WINDOW_POS'] = f"{desktop.x},{desktop.y}"
+        else:
+            monitors = [pygame.Rect((0, 0), self.settings.window_size or desktop_size())]
+            desktop = monitors[0]
+        self.monitors = [monitor.move(-desktop.x, -desktop.y) for monitor in monitors]
+        self.view = self.monitors[0]
+        self.width, self.height = self.view.size
+        self.cols = desktop.width // self.settings.snake_block
+        self.rows = desktop.height // self.settings.snake_block
+        self.walls = self._gap_cells()
+        self.screen = pygame.display.set_mode(desktop.size, pygame.NOFRAME)
+        self.screen.fill(self.colors.FUCHSIA)
+        self.compositor = Compositor(self.screen, self.settings.tile_size)
+        self.board = self.compositor.board
+        self.board.fill(self.colors.FUCHSIA)
+        self.window_backend.apply(tuple(desktop), self.colors.FUCHSIA)
+    
+    def _gap_cells(self):
+        """Packed cells some part of which no monitor shows, plus any they cut off
+
+        Cells are checked against the union of the monitors, so a cell
+        that straddles two adjoining monitors stays open. Open cells that
+        cannot be reached from the start cell are walled as well, so food
+        never spawns where the snake cannot get to it.
+        """
+        block = self.settings.snake_block
+        cols, rows = self.cols, self.rows
+        monitors = self.monitors
+        # The monitor edges split the desktop into pieces each either shown or not
+        xs = sorted({x for monitor in monitors for x in (monitor.left, monitor.right)})
+        ys = sorted({y for monitor in monitors for y in (monitor.top, monitor.bottom)})
+        shown = {(i, j) for i in range(len(xs) - 1) for j in range(len(ys) - 1)
+                 if any(monitor.collidepoint(xs[i], ys[j]) for monitor in monitors)}
+
+        def pieces(edges, count):
+            """Per cell the pieces its pixels fall in, None if some are off the desktop"""
+            result = []
+            for n in range(count):
+                low, high = n * block, (n + 1) * block
+                if low < edges[0] or high > edges[-1]:
+                    result.append(None)
+                else:
+                    result.append(range(bisect_right(edges, low) - 1, bisect_left(edges, high)))
+            return result
+
+        col_pieces, row_pieces = pieces(xs, cols), pieces(ys, rows)
+        covered = {}
+        walls = bytearray(cols * rows)
+        for y, row_span in enumerate(row_pieces):
+            for x, col_span in enumerate(col_pieces):
+                key = (col_span, row_span)
+                if key not in covered:
+                    covered[key] = (col_span is not None and row_span is not None
+                                    and all((i, j) in shown for i in col_span for j in row_span))
+                if not covered[key]:
+                    walls[y * cols + x] = 1
+        if not any(walls):
+            return []
+
+        # Keep only the open region the snake starts in
+        start = SnakeEngine(cols, rows, walls=[cell for cell, wall in enumerate(walls) if wall]).start
+        reached = bytearray(walls)
+        reached[start] = 1
+        frontier = deque([start])
+        while frontier:
+            cell = frontier.popleft()
+            x = cell % cols
+            for neighbor in (cell - cols if cell >= cols else -1,
+                             cell + cols if cell + cols < len(walls) else -1,
+                             cell - 1 if x else -1,
+                             cell + 1 if x + 1 < cols else -1):
+                if neighbor >= 0 and not reached[neighbor]:
+                    reached[neighbor] = 1
+                    frontier.append(neighbor)
+        return [cell for cell in range(len(walls)) if walls[cell] or not reached[cell]]
+    
+    def _frame_rate(self):
+        """Render rate: max_fps if set, else the display refresh rate"""
+        if self.settings.max_fps:
+            return self.settings.max_fps
+        try:
+            rates = pygame.display.get_desktop_refresh_rates()
+        except (AttributeError, pygame.error):
+            rates = []
+        return rates[0] if rates and rates[0] > 0 else 60
+    
+    def _create_autopilot(self):
+        """Build the configured autopilot planner, if any
+        
+        Planners that ponder search on in the frames between ticks, so a
+        decision only takes a share of one frame and never stalls motion.
+        """
+        if not self.settings.autopilot:
+            return None
+        planner_cls = self.AUTOPILOTS[self.settings.autopilot]
+        rate = self.frame_rate if planner_cls.ponders else self.settings.snake_speed
+        options = {'workers': self.settings.autopilot_workers} if self.settings.autopilot_workers else {}
+        return planner_cls(self.cols, self.rows, budget=self.settings.autopilot_budget / rate,
+                           walls=self.engine.walls, **options)
+    
+    def _open_leaderboard(self):
+        """Game history database, kept in memory for the session if its file can't be opened"""
+        path = self.resources.data_path(self.settings.leaderboard_file)
+        try:
+            return Leaderboard(path)
+        except sqlite3.Error as e:
+            print(f"Game history not saved ({path}): {e}")
+            return Leaderboard(':memory:')
+    
+    def _create_inputs(self):
+        """Input sources besides the keyboard, see controls.py"""
+        if not self.settings.controller or self.replay:
+            return []
+        from controls import SocketController  # Pulls in asyncio, only when asked for
+        try:
+            return [SocketController(self.settings.controller)]
+        except (OSError, ValueError) as e:
+            print(f"Controller socket not opened: {e}")
+            return []
+    
+    @property
+    def bot(self):
+        """Name of what plays instead of a human (autopilot or a controller that connected), or None"""
+        if self.autopilot:
+            return self.autopilot.name
+        for source in self.inputs:
+            if source.active:
+                return source.name
+        return None
+    
+    def _create_profiler(self):
+        """Frame profiler with the hot drawing methods wrapped into its phases"""
+        if not self.settings.profile:
+            return None
+        profiler = FrameProfiler(budget=1 / self.frame_rate)
+        phases = {
+            'logic': ('_tick',),
+            'food': ('_draw_food',),
+            'snake': ('_draw_snake', '_draw_motion', '_repaint_rect'),
+            'hud': ('_draw_score', '_draw_high_scores', '_draw_controls'),
+            'present': ('_present',),
+        }
+        # Instance attributes shadow the methods, so nothing is wrapped unless profiling
+        for phase, names in phases.items():
+            for name in names:
+                setattr(self, name, profiler.wrap(phase, getattr(self, name)))
+        return profiler
+    
+    def _resume(self):
+        """Continue the game that was running when the last session quit
+        
+        Its food no longer follows from the seed, so a resumed session
+        is not recorded as a replay.
+        """
+        state = resume(self.engine, self.resources.data_path(self.settings.suspend_file))
+        if state:
+            self.settings.record_replays = False
+            self.settings.seed = state.seed if state.seed >= 0 else None
+        return state
+    
+    def _start_recording(self):
+        """Replay writer for this session, if recording is on; its file appears with the first event"""
+        if not self.settings.record_replays:
+            return None
+        settings = self.settings
+        replay_dir = self.resources.data_path(settings.replay_dir)
+        path = os.path.join(replay_dir, time.strftime("hebi-%Y%m%d-%H%M%S.hbr"))
+        try:
+            os.makedirs(replay_dir, exist_ok=True)
+            return ReplayWriter(path, settings.seed, self.cols, self.rows,
+                                settings.snake_block, settings.snake_speed, self.engine.walls)
+        except OSError as e:
+            print(f"Replay not recorded: {e}")
+            return None
+    
+    def _quit(self):
+        """Shut down and exit, reporting autopilot latency and frame times
+        
+        A game still in progress is suspended to disk and picked up again
+        by the next start.
+        """
+        engine = self.engine
+        if engine.alive and engine.ticks and not self.replay:
+            try:
+                suspend(engine, self.resources.data_path(self.settings.suspend_file), self.settings.seed)
+            except OSError as e:
+                print(f"Game not suspended: {e}")
+        if self.recorder:
+            self.recorder.close(self.engine.ticks)
+        for source in self.inputs:
+            source.close()
+        if self.autopilot:
+            self.autopilot.close()
+            self._report(f"{self.autopilot.name} autopilot", self.autopilot.stats)
+        if self.profiler:
+            self._report("profile", self.profiler)
+            if self.settings.profile_file:
+                self.profiler.export(self.settings.profile_file)
+        if self.settings.report_stats:
+            self._report(f"frames @ {self.frame_rate} fps", self.frame_stats)
+            if self.turns.latency.count:
+                self._report("turn wait", self.turns.latency)
+            # Text renders happen on misses only; in steady play they should stay near 0 per frame
+            text = self.text_cache.stats()
+            per_frame = text["misses"] / self.frame_stats.count if self.frame_stats.count else 0.0
+            print(f"text cache: hits={text['hits']}, misses={text['misses']}, size={text['size']}, "
+                  f"renders_per_frame={per_frame:.3f}")
+            busy = self.idle_cpu / self.idle_wall * 100 if self.idle_wall else 0.0
+            print(f"idle screens: {self.idle_wall:.1f} s waiting, {busy:.2f}% CPU")
+        pygame.quit()
+        sys.exit()
+    
+    def _report(self, label, stats):
+        """Print a LatencyStats summary on one line"""
+        print(f"{label}: " + ", ".join(
+            f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in stats.summary().items()))
+    
+    @property
+    def font_small(self):
+        return self.fonts.get('Arial', 24)
+    
+    @property
+    def font_medium(self):
+        return self.fonts.get('Arial', 36)
+    
+    @property
+    def font_large(self):
+        return self.fonts.get('Arial', 72, bold=True)
+    
+    def _first_frame(self):
+        """Close the startup timeline once something is on screen"""
+        if self.startup.done:
+            return
+        self.startup.done = True
+        self.startup.mark("first frame")
+        if self.settings.report_stats:
+            self.startup.report()
     
     def run(self):
-        """Main game loop"""
-        self._show_welcome_screen()
+        """Main loop: each screen runs until it hands over to the next one"""
+        self.recorder = self._start_recording()
+        screen = self._play if self.replay or self.resumed else self._show_welcome_screen
+        while True:
+            screen = screen()
+    
+    def _wait_event(self, timeout=None):
+        """Sleep until the next event or timeout (ms), quitting on Q
+        
+        Static screens block here instead of spinning, so they cost no
+        CPU between events. Returns a NOEVENT event on timeout.
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        event = pygame.event.wait(timeout) if timeout else pygame.event.wait()
+        self.idle_wall += time.perf_counter() - wall
+        self.idle_cpu += time.process_time() - cpu
+        
+        if event.type == pygame.QUIT:
+            self._quit()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_q:
+            self._quit()
+        return event
+    
+    def _play(self):
+        """Active game, the only screen driven by a frame clock"""
+        engine = self.engine
+        tick_ms = 1000 / self.settings.snake_speed
+        self._start_game()
+        if self.resumed and not self.bot:
+            # Let the player find the snake again before it moves
+            self.resumed = None
+            self._render_full()
+            self._present()
+            self._pause()
         
         while True:
-            # Game state variables
-            game_over = False
-            game_close = False
-            paused = False
-            high_score_processed = False
+            if not engine.alive:
+                for source in self.inputs:
+                    source.game_over(engine)
+                if self.recorder:
+                    self.recorder.game_over(engine.ticks, engine.score)
+                if self.bot:
+                    self._record_game(None)
+                if self.replay:
+                    if not self.replay.next_game():
+                        self._quit()
+                    engine.reset()
+                    self._start_game()
+                    continue
+                if not self.bot:
+                    return self._show_game_over
+                # Bots just start over
+                engine.reset()
+                self._start_game()
             
-            # Snake initialization
-            x1, y1 = self.width / 2, self.height / 2
-            x1_change, y1_change = 0, 0
-            snake_list = []
-            length_of_snake = 1
+            # Event handling, sampled every frame
+            events_start = time.perf_counter()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self._quit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:  # Global quit
+                        self._quit()
+                    elif event.key == pygame.K_p:  # Pause
+                        self._pause()
+                    elif event.key == pygame.K_F3 and self.profiler:
+                        self._toggle_profile_overlay()
+                    elif event.key in self.KEY_DIRECTIONS:
+                        self._queue_turn(self.KEY_DIRECTIONS[event.key])
+            for source in self.inputs:
+                for stamp, direction in source.poll(engine):
+                    self._queue_turn(direction, stamp)
             
-            # Food initialization
-            foodx, foody = self._generate_food_position()
-            score = 0
+            # Game logic at a fixed rate, however fast frames come
+            frame_start = time.perf_counter()
+            if self.profiler:
+                self.profiler.add('events', frame_start - events_start)
+            while self._accumulator >= tick_ms and engine.alive:
+                if self.replay and self.replay.at_end(engine.ticks):
+                    self._quit()
+                self._accumulator -= tick_ms
+                self._tick()
+            if not engine.alive:
+                continue
             
-            while not game_over:
-                # Game over state
-                while game_close:
-                    self.screen.fill(self.colors.FUCHSIA)
-                    
-                    if not high_score_processed and self.high_score_manager.is_high_score(score):
-                        self._get_player_name(score)
-                        high_score_processed = True
-                    
-                    self._draw_game_over(score)
-                    
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            pygame.quit()
-                            sys.exit()
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_q:
-                                pygame.quit()
-                                sys.exit()
-                            if event.key == pygame.K_c:
-                                game_close = False
-                                high_score_processed = False
-                                x1, y1 = self.width / 2, self.height / 2
-                                x1_change = y1_change = 0
-                                snake_list = []
-                                length_of_snake = 1
-                                foodx, foody = self._generate_food_position()
-                                score = 0
-                
-                # Event handling
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_q:  # Global quit
-                            pygame.quit()
-                            sys.exit()
-                        elif event.key == pygame.K_p:  # Pause toggle
-                            paused = not paused
-                        elif not paused:
-                            if event.key == pygame.K_LEFT and x1_change == 0:
-                                x1_change = -self.settings.snake_block
-                                y1_change = 0
-                            elif event.key == pygame.K_RIGHT and x1_change == 0:
-                                x1_change = self.settings.snake_block
-                                y1_change = 0
-                            elif event.key == pygame.K_UP and y1_change == 0:
-                                y1_change = -self.settings.snake_block
-                                x1_change = 0
-                            elif event.key == pygame.K_DOWN and y1_change == 0:
-                                y1_change = self.settings.snake_block
-                                x1_change = 0
-                
-                if paused:
-                    self._draw_pause()
-                    pygame.display.update()
-                    self.clock.tick(self.settings.snake_speed)
-                    continue
-                
-                # Game logic
-                if x1 >= self.width or x1 < 0 or y1 >= self.height or y1 < 0:
-                    game_close = True
-                
-                x1 += x1_change
-                y1 += y1_change
-                self.screen.fill(self.colors.FUCHSIA)
-                
-                # Draw food
-                self._draw_food(foodx, foody)
-                
-                # Update snake
-                snake_head = [x1, y1]
-                snake_list.append(snake_head)
-                if len(snake_list) > length_of_snake:
-                    del snake_list[0]
-                
-                # Check self collision
-                for x in snake_list[:-1]:
-                    if x == snake_head:
-                        game_close = True
-                
-                # Draw snake
-                self._draw_snake(snake_list)
-                
-                # Draw UI elements
-                self._draw_score(score)
-                self._draw_high_scores()
-                self._draw_controls()
-                
-                pygame.display.update()
-                
-                # Food collision
-                if x1 == foodx and y1 == foody:
-                    foodx, foody = self._generate_food_position()
-                    length_of_snake += 1
-                    score += 10
-                
-                self.clock.tick(self.settings.snake_speed)
+            # Draw board, sliding head and tail between the last two ticks
+            self._render_frame(self._accumulator / tick_ms)
+            if self.autopilot and self.autopilot.ponders:
+                # Search ahead with what is left of the frame's planning share
+                self.autopilot.ponder(engine, events_start + self.autopilot.budget)
+            self.frame_stats.record(time.perf_counter() - frame_start)
+            
+            elapsed = self.clock.tick(self.frame_rate)
+            if self.profiler:
+                self.profiler.end_frame(elapsed / 1000)
+            self._accumulator += min(elapsed, self.MAX_FRAME_MS)
+    
+    def _show_game_over(self):
+        """Game over screen: name entry for a high score, then wait for C"""
+        score = self.engine.score
+        self.screen.fill(self.colors.FUCHSIA)
+        self.high_score_manager.refresh()
+        name = None
+        if self.high_score_manager.is_high_score(score):
+            name = self._get_player_name(score)
+        self._record_game(name)
+        self._draw_game_over(score)
+        
+        while True:
+            event = self._wait_event()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_c:
+                self.engine.reset()
+                return self._play
+    
+    def _record_game(self, name):
+        """Add the game that just ended to the leaderboard history"""
+        engine = self.engine
+        try:
+            self.leaderboard.record(
+                engine.score, name=name, length=len(engine.snake),
+                duration=engine.ticks / self.settings.snake_speed, seed=self.settings.seed,
+                autopilot=self.bot)
+        except sqlite3.Error as e:
+            print(f"Game not added to the history: {e}")
+    
+    def _start_game(self):
+        """Reset per-game loop state after the engine was reset"""
+        self._full_redraw = True
+        self.turns.clear()
+        self._motion = None
+        self._accumulator = 0
+        self.clock.tick()
     
-    def _generate_food_position(self):
-        """Generate random food position"""
-        return (
-            round(random.randrange(0, self.width - self.settings.snake_block) / 20.0) * 20.0,
-            round(random.randrange(0, self.height - self.settings.snake_block) / 20.0) * 20.0
-        )
+    def _queue_turn(self, direction, stamp=None):
+        """Buffer a turn for the coming ticks so quick presses aren't lost"""
+        if not (self.autopilot or self.replay):
+            self.turns.push(direction, self.engine.direction, stamp)
+    
+    def _tick(self):
+        """Advance the engine one logic step and paint the new board state"""
+        engine = self.engine
+        direction = None
+        if self.replay:
+            direction = self.replay.turn_at(engine.ticks)
+        elif self.autopilot:
+            direction = self.autopilot.decide(engine)
+        else:
+            direction = self.turns.pop()
+        if direction and engine.turn(direction) and self.recorder:
+            self.recorder.turn(engine.ticks, direction)
+        
+        prev_head = engine.snake.head
+        if not engine.step():
+            return False
+        for source in self.inputs:
+            source.tick(engine)
+        stale = self._motion_rects()
+        if self.settings.smooth_motion:
+            self._motion = (prev_head, engine.snake.head, engine.vacated)
+            self._alpha = 0.0
+        
+        if self._full_redraw or not self.settings.incremental_render:
+            self._render_full()
+        else:
+            self._render_incremental()
+            # Clear what the previous tick's sliding segments left behind
+            for rect in stale:
+                self._repaint_rect(rect)
+        return True
+    
+    def _render_frame(self, alpha):
+        """Paint the in-between frame for interpolation alpha and present it"""
+        if not self.settings.incremental_render:
+            self._render_full()
+        self._alpha = alpha
+        self._render_motion()
+        if self._profile_overlay:
+            self._draw_profile_overlay()
+        self._present()
+    
+    def _toggle_profile_overlay(self):
+        """Show or hide the profiler overlay (F3)"""
+        if self._profile_overlay:
+            self._profile_overlay = None
+            self.compositor.set_layer('profile', [])
+        else:
+            self._profile_overlay = (0.0, None)
+    
+    def _draw_profile_overlay(self):
+        """Frame time percentiles, drops and per-phase p95, refreshed twice a second"""
+        updated, surface = self._profile_overlay
+        now = time.perf_counter()
+        if surface is None or now - updated > 0.5:
+            profiler = self.profiler
+            summary = profiler.summary()
+            lines = [
+                f"frame p50 {summary['p50_ms']:.2f}  p95 {summary['p95_ms']:.2f}  "
+                f"p99 {summary['p99_ms']:.2f} ms",
+                f"dropped {summary['dropped']} of {summary['frames']}, "
+                f"budget {profiler.budget * 1000:.1f} ms",
+            ] + [f"{phase:>8} p95 {profiler.history[phase].percentile(95) * 1000:.3f} ms"
+                 for phase in profiler.PHASES]
+            font = self.fonts.get('Arial', 16)
+            height = font.get_linesize()
+            surface = pygame.Surface((300, height * len(lines) + 10))
+            surface.fill(self.colors.DARK_GRAY)
+            for i, line in enumerate(lines):
+                surface.blit(font.render(line, True, self.colors.WHITE), (5, 5 + i * height))
+            self._profile_overlay = (now, surface)
+            self.compositor.set_layer('profile', [(surface, (self.view.x + 20, self.view.y + 60))])
+    
+    def _present(self):
+        """Composite the tiles changed since the last present and push them to the display"""
+        rects = self.compositor.composite()
+        if rects:
+            pygame.display.update(rects)
+        self._first_frame()
+    
+    def _render_full(self):
+        """Repaint the whole board and HUD and recomposite every monitor"""
+        engine = self.engine
+        food, score, snake = engine.food, engine.score, engine.snake
+        # Gaps between monitors are never drawn on, only monitors need clearing
+        for monitor in self.monitors:
+            self.board.fill(self.colors.FUCHSIA, monitor)
+            self.compositor.invalidate(monitor)
+        self._painted = bytearray(self.cols * self.rows)
+        self._draw_food(*self._food_rect(food).topleft)
+        self._draw_snake(snake)
+        self._draw_controls()
+        self._draw_score(score)
+        self._draw_high_scores()
+        
+        self._painted_food = food
+        self._painted_score = score
+        self._painted_length = len(snake)
+        self._full_redraw = False
+    
+    def _render_incremental(self):
+        """Repaint only what changed since the last tick, marking those tiles dirty"""
+        engine = self.engine
+        food, score, snake, vacated = engine.food, engine.score, engine.snake, engine.vacated
+        if score != self._painted_score:
+            # The HUD sits in its own layer, the board under it stays as it is
+            self._painted_score = score
+            self._draw_score(score)
+        
+        if food != self._painted_food:
+            old_food = self._painted_food
+            self._painted_food = food
+            self._repaint_rect(self._food_rect(old_food))
+            self._repaint_rect(self._food_rect(food))
+        
+        if vacated is not None and vacated not in snake:
+            self._set_cell_level(vacated, 0)
+        
+        length = len(snake)
+        levels = self.settings.gradient_levels
+        if length != self._painted_length or length <= levels + 2:
+            # Growing shifts every gradient level
+            self._painted_length = length
+            for i, cell in enumerate(snake):
+                self._set_cell_level(cell, self._segment_level(i, length))
+        else:
+            # Moving only shifts cells sitting on a gradient level boundary
+            body = snake.body
+            indices = {length - 2, length - 1}
+            for level in range(1, levels):
+                first = -(-level * length // levels)
+                indices.update((first - 1, first))
+            for i in indices:
+                self._set_cell_level(body[i], self._segment_level(i, length))
+    
+    def _motion_rects(self):
+        """Screen areas the sliding head and tail sweep over"""
+        if not self._motion:
+            return []
+        prev_head, head, vacated = self._motion
+        rects = [self._cell_rect(prev_head).union(self._cell_rect(head))]
+        if vacated is not None and vacated != head:
+            rects.append(self._cell_rect(vacated).union(self._cell_rect(self.engine.snake.tail)))
+        return rects
+    
+    def _render_motion(self):
+        """Repaint the sliding head and tail at the current interpolation"""
+        for rect in self._motion_rects():
+            self._repaint_rect(rect)
+    
+    def _draw_motion(self):
+        """Draw the head and tail segments part way to their new cells"""
+        prev_head, head, vacated = self._motion
+        length = len(self.engine.snake)
+        if vacated is not None and vacated != head:
+            tail = self.engine.snake.tail
+            self._draw_segment(*self._lerp(vacated, tail), self._segment_level(0, length))
+        self._draw_segment(*self._lerp(prev_head, head), self._segment_level(length - 1, length))
+    
+    def _lerp(self, start, end):
+        """Pixel position between two cells at the current interpolation"""
+        a, b = self._cell_rect(start), self._cell_rect(end)
+        return (round(a.x + (b.x - a.x) * self._alpha),
+                round(a.y + (b.y - a.y) * self._alpha))
+    
+    def _segment_level(self, index, length):
+        """Quantized gradient level of a segment, 0 is an empty cell"""
+        levels = self.settings.gradient_levels
+        if index == length - 1:  # Head
+            return levels + 1
+        return 1 + levels * index // length
+    
+    def _build_level_colors(self):
+        """Segment color for every gradient level"""
+        levels = self.settings.gradient_levels
+        colors = [None]
+        for level in range(1, levels + 1):
+            fade = 0.3 + 0.7 * ((level - 1) / levels)
+            colors.append((0, int(255 * fade), 0))
+        colors.append(self.colors.GREEN)
+        return colors
+    
+    def _set_cell_level(self, cell, level):
+        """Repaint a cell if its painted level is stale"""
+        if self._painted[cell] != level:
+            self._painted[cell] = level
+            self._repaint_rect(self._cell_rect(cell))
+    
+    def _cell_rect(self, cell):
+        """Screen rect of a packed cell"""
+        block = self.settings.snake_block
+        row, col = divmod(cell, self.cols)
+        return pygame.Rect(col * block, row * block, block, block)
+    
+    def _food_rect(self, cell):
+        """Screen rect covered by the food circle"""
+        # The anti-aliased outline spills one pixel past the cell
+        rect = self._cell_rect(cell)
+        rect.size = (rect.width + 1, rect.height + 1)
+        return rect
+    
+    def _repaint_rect(self, rect):
+        """Redraw the board clipped to rect and mark its tiles dirty"""
+        block = self.settings.snake_block
+        self.board.set_clip(rect)
+        self.board.fill(self.colors.FUCHSIA, rect)
+        
+        food_rect = self._food_rect(self._painted_food)
+        if rect.colliderect(food_rect):
+            self._draw_food(*food_rect.topleft)
+        
+        painted = self._painted
+        moving = self._motion[1] if self._motion else -1
+        draws = []
+        for row in range(max(rect.top // block, 0), min((rect.bottom - 1) // block + 1, self.rows)):
+            for col in range(max(rect.left // block, 0), min((rect.right - 1) // block + 1, self.cols)):
+                cell = row * self.cols + col
+                if painted[cell] and cell != moving:
+                    draws.append(self.sprites.blit_args('segment', painted[cell] - 1, (col * block, row * block)))
+        self.board.blits(draws, doreturn=False)
+        if self._motion:
+            self._draw_motion()
+        
+        self.board.set_clip(None)
+        self.compositor.invalidate(rect)
     
     def _draw_food(self, x, y):
         """Draw food at given position"""
-        center_x = int(x + self.settings.snake_block/2)
-        center_y = int(y + self.settings.snake_block/2)
-        radius = int(self.settings.snake_block/2)
-        pygame.gfxdraw.filled_circle(self.screen, center_x, center_y, radius, self.colors.RED)
-        pygame.gfxdraw.aacircle(self.screen, center_x, center_y, radius, self.colors.BLACK)
+        self.sprites.draw(self.board, 'food', 0, (x, y))
     
-    def _draw_snake(self, snake_list):
+    def _draw_snake(self, snake):
         """Draw the snake"""
-        for i, segment in enumerate(snake_list):
-            if i == len(snake_list) - 1:  # Head
-                color = self.colors.GREEN
-            else:  # Body with gradient
-                fade = 0.3 + 0.7 * (i / len(snake_list))
-                color = (0, int(255 * fade), 0)
-            
-            pygame.draw.rect(self.screen, color, [segment[0], segment[1], 
-                           self.settings.snake_block, self.settings.snake_block])
-            pygame.draw.rect(self.screen, self.colors.BLACK, 
-                           [segment[0], segment[1], self.settings.snake_block, self.settings.snake_block], 1)
+        block = self.settings.snake_block
+        length = len(snake)
+        sprites = self.sprites
+        painted = self._painted
+        draws = []
+        for i, cell in enumerate(snake):
+            level = self._segment_level(i, length)
+            painted[cell] = level
+            row, col = divmod(cell, self.cols)
+            draws.append(sprites.blit_args('segment', level - 1, (col * block, row * block)))
+        self.board.blits(draws, doreturn=False)
+    
+    def _draw_segment(self, x, y, level):
+        """Draw a single snake segment with its gradient color"""
+        self.sprites.draw(self.board, 'segment', level - 1, (x, y))
+    
+    def _build_sprites(self, block):
+        """Sprite atlas for a cell size: food, then the gradient ramp ending in the head"""
+        from pygame import gfxdraw
+        atlas = SpriteAtlas(self.colors.FUCHSIA)
+        
+        radius = block // 2
+        food = pygame.Surface((block + 1, block + 1))
+        food.fill(self.colors.FUCHSIA)
+        gfxdraw.filled_circle(food, radius, radius, radius, self.colors.RED)
+        gfxdraw.aacircle(food, radius, radius, radius, self.colors.BLACK)
+        atlas.add('food', [food])
+        
+        tiles = []
+        for color in self._level_colors[1:]:
+            tile = pygame.Surface((block, block))
+            tile.fill(self.colors.BLACK)
+            tile.fill(color, tile.get_rect().inflate(-2, -2))
+            tiles.append(tile)
+        atlas.add('segment', tiles)
+        return atlas.build()
     
     def _draw_score(self, score):
-        """Draw current score"""
-        score_text = self.font_small.render(f"Score: {score}", True, self.colors.WHITE)
-        self.screen.blit(score_text, [20, 20])
+        """Set the score layer to the current score"""
+        score_text = self.text_cache.render(self.font_small, f"Score: {score}", True, self.colors.WHITE)
+        return self.compositor.set_layer('score', [(score_text, (self.view.x + 20, self.view.y + 20))])
     
     def _draw_high_scores(self):
-        """Draw high score list"""
-        if not self.high_score_manager.scores:
-            return
+        """Set the high score layer to the best human games, cached until the next one is recorded"""
+        best = self.leaderboard.top(3, human=True)
+        if not best:
+            return self.compositor.set_layer('high_scores', [])
         
-        hs_text = self.font_small.render("HIGH SCORES:", True, self.colors.GOLD)
-        self.screen.blit(hs_text, [self.width - 220, 20])
-        
-        for i, entry in enumerate(self.high_score_manager.scores[:3]):
-            entry_text = f"{i+1}. {entry['name']}: {entry['score']}"
-            text = self.font_small.render(entry_text, True, self.colors.WHITE)
-            self.screen.blit(text, [self.width - 220, 50 + i * 30])
+        hs_text = self.text_cache.render(self.font_small, "HIGH SCORES:", True, self.colors.GOLD)
+        blits = [(hs_text, (self.view.right - 220, self.view.y + 20))]
+        for i, (name, score) in enumerate(best):
+            entry_text = f"{i+1}. {name or 'Nameless Anon'}: {score}"
+            text = self.text_cache.render(self.font_small, entry_text, True, self.colors.WHITE)
+            blits.append((text, (self.view.right - 220, self.view.y + 50 + i * 30)))
+        return self.compositor.set_layer('high_scores', blits)
     
     def _draw_controls(self):
-        """Draw control instructions"""
-        controls = self.font_small.render("ARROWS: Move | P: Pause | Q: Quit", True, self.colors.WHITE)
-        self.screen.blit(controls, [self.width//2 - controls.get_width()//2, self.height - 40])
+        """Set the controls layer to the control instructions"""
+        hint = "AUTOPILOT" if self.autopilot else "ARROWS: Move"
+        controls = self.text_cache.render(self.font_small, f"{hint} | P: Pause | Q: Quit", True, self.colors.WHITE)
+        pos = (self.view.centerx - controls.get_width()//2, self.view.bottom - 40)
+        return self.compositor.set_layer('controls', [(controls, pos)])
+    
+    def _build_overlays(self):
+        """Register every modal screen with the overlay cache"""
+        overlays = OverlayManager((self.width, self.height))
+        overlays.register('pause', self._build_pause_overlay, translucent=True)
+        overlays.register('game_over', self._build_game_over_screen)
+        overlays.register('welcome', self._build_welcome_screen)
+        overlays.register('name_entry', lambda surface: self._build_name_entry_overlay(surface, True),
+                          translucent=True)
+        overlays.register('name_entry_zero', lambda surface: self._build_name_entry_overlay(surface, False),
+                          translucent=True)
+        return overlays
     
-    def _draw_pause(self):
-        """Draw pause screen"""
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill(self.colors.PAUSE_OVERLAY)
-        self.screen.blit(overlay, (0, 0))
+    def _blit_centered(self, surface, font, text, color, center):
+        """Render text centered on a point"""
+        rendered = font.render(text, True, color)
+        surface.blit(rendered, rendered.get_rect(center=center))
+    
+    def _build_pause_overlay(self, surface):
+        """Paint the pause screen"""
+        surface.fill(self.colors.PAUSE_OVERLAY)
         
         pause_text = self.font_large.render("PAUSED", True, self.colors.WHITE)
-        self.screen.blit(pause_text, (self.width//2 - pause_text.get_width()//2, self.height//2 - 50))
+        surface.blit(pause_text, (self.width//2 - pause_text.get_width()//2, self.height//2 - 50))
         
         continue_text = self.font_medium.render("Press P to continue", True, self.colors.WHITE)
-        self.screen.blit(continue_text, (self.width//2 - continue_text.get_width()//2, self.height//2 + 50))
+        surface.blit(continue_text, (self.width//2 - continue_text.get_width()//2, self.height//2 + 50))
     
-    def _draw_game_over(self, score):
-        """Draw game over screen"""
-        msg = self.font_large.render("GAME OVER", True, self.colors.RED)
-        msg_rect = msg.get_rect(center=(self.width/2, self.height/3))
-        self.screen.blit(msg, msg_rect)
-        
-        options = self.font_medium.render("Press Q to Quit or C to Continue", True, self.colors.WHITE)
-        options_rect = options.get_rect(center=(self.width/2, self.height/2 + 100))
-        self.screen.blit(options, options_rect)
-        
-        self._draw_score(score)
-        self._draw_high_scores()
-        pygame.display.update()
+    def _build_game_over_screen(self, surface):
+        """Paint the static part of the game over screen"""
+        surface.fill(self.colors.FUCHSIA)
+        self._blit_centered(surface, self.font_large, "GAME OVER", self.colors.RED,
+                            (self.width/2, self.height/3))
+        self._blit_centered(surface, self.font_medium, "Press Q to Quit or C to Continue", self.colors.WHITE,
+                            (self.width/2, self.height/2 + 100))
     
-    def _show_welcome_screen(self):
-        """Show welcome screen"""
-        self.screen.fill(self.colors.FUCHSIA)
+    def _build_welcome_screen(self, surface):
+        """Paint the welcome screen"""
+        surface.fill(self.colors.FUCHSIA)
         
         title = self.font_large.render("HEBI THE TRANSPARENT SNAKE", True, self.colors.GREEN)
-        self.screen.blit(title, (self.width//2 - title.get_width()//2, self.height//3))
+        surface.blit(title, (self.width//2 - title.get_width()//2, self.height//3))
         
         controls = [
             "Use ARROW KEYS to move",
@@ -290,30 +909,57 @@ class SnakeGame:
         
         for i, line in enumerate(controls):
             text = self.font_medium.render(line, True, self.colors.WHITE)
-            self.screen.blit(text, (self.width//2 - text.get_width()//2, self.height//2 + i * 40))
+            surface.blit(text, (self.width//2 - text.get_width()//2, self.height//2 + i * 40))
+    
+    def _build_name_entry_overlay(self, surface, scored):
+        """Paint the dimmed backdrop and fixed text of the name entry screen"""
+        surface.fill((0, 0, 0, 200))
+        title = "NEW HIGH SCORE!" if scored else "WOW SO ZERO, VERY NICE!"
+        self._blit_centered(surface, self.font_large, title, self.colors.GOLD,
+                            (self.width/2, self.height/2 - 120))
+        self._blit_centered(surface, self.font_small, "Enter your name (15 chars max):", self.colors.WHITE,
+                            (self.width/2, self.height/2 - 10))
+    
+    def _pause(self):
+        """Show the pause screen and sleep until the player resumes"""
+        self.overlays.blit(self.screen, 'pause', self.view.topleft)
+        pygame.display.update()
         
+        while True:
+            event = self._wait_event()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                break
+        
+        self._render_full()
+        self._render_motion()
+        self._present()
+        self._accumulator = 0
+        self.clock.tick()
+    
+    def _draw_game_over(self, score):
+        """Draw game over screen"""
+        self.overlays.blit(self.screen, 'game_over', self.view.topleft)
+        self._draw_score(score)
+        self._draw_high_scores()
+        # The overlay covers the composited screen, put the HUD back on top of it
+        self.compositor.draw_layers('score', 'high_scores')
         pygame.display.update()
+    
+    def _show_welcome_screen(self):
+        """Show welcome screen"""
+        self.overlays.blit(self.screen, 'welcome', self.view.topleft)
+        pygame.display.update()
+        self._first_frame()
         
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        pygame.quit()
-                        sys.exit()
-                    waiting = False
+        while self._wait_event().type != pygame.KEYDOWN:
+            pass
+        return self._play
     
     def _get_player_name(self, score):
         """Get player name for high score"""
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        
         input_width = 400
         input_height = 60
-        input_box = pygame.Rect(self.width/2 - input_width/2, self.height/2 + 40, input_width, input_height)
+        input_box = pygame.Rect(self.view.centerx - input_width/2, self.view.centery + 40, input_width, input_height)
         color_inactive = pygame.Color(100, 100, 100)
         color_active = pygame.Color(140, 140, 140)
         color = color_inactive
@@ -322,108 +968,113 @@ class SnakeGame:
         done = False
         name_recorded = False
         
-        title_y = self.height/2 - 120
-        score_y = self.height/2 - 60
-        instruction_y = self.height/2 - 10
+        # Backdrop, title and score are drawn once; only the input box repaints
+        self.overlays.blit(self.screen, 'name_entry' if score else 'name_entry_zero', self.view.topleft)
+        score_text = self.text_cache.render(self.font_medium, f"Score: {score}", True, self.colors.WHITE)
+        self.screen.blit(score_text, score_text.get_rect(center=(self.view.centerx, self.view.centery - 60)))
+        box_backdrop = self.screen.subsurface(input_box).copy()
+        pygame.display.update()
         
+        blink_ms = 500
         while not done:
-            mouse_pos = pygame.mouse.get_pos()
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    done = True
-                    pygame.quit()
-                    sys.exit()
-                    
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    active = input_box.collidepoint(event.pos)
-                    color = color_active if active else color_inactive
-                    
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_q:
-                        done = True
-                        pygame.quit()
-                        sys.exit()
-                    if active:
-                        if event.key == pygame.K_RETURN:
-                            if text.strip():
-                                done = True
-                                name_recorded = True
-                            else:
-                                return "Nameless Anon"
-                        elif event.key == pygame.K_BACKSPACE:
-                            text = text[:-1]
-                        elif len(text) < 15:
-                            text += event.unicode
-            
-            self.screen.blit(overlay, (0, 0))
-            
-            GOOD_SCORE = "NEW HIGH SCORE!"
-            TROLL_SCORE = "WOW SO ZERO, VERY NICE!"
-            if score: TROLL_SCORE = GOOD_SCORE
-            title = self.font_large.render(TROLL_SCORE, True, self.colors.GOLD)
-            title_rect = title.get_rect(center=(self.width/2, title_y))
-            self.screen.blit(title, title_rect)
-            
-            score_text = self.font_medium.render(f"Score: {score}", True, self.colors.WHITE)
-            score_rect = score_text.get_rect(center=(self.width/2, score_y))
-            self.screen.blit(score_text, score_rect)
-            
-            instruct = self.font_small.render("Enter your name (15 chars max):", True, self.colors.WHITE)
-            instruct_rect = instruct.get_rect(center=(self.width/2, instruction_y))
-            self.screen.blit(instruct, instruct_rect)
-            
+            self.screen.blit(box_backdrop, input_box)
             pygame.draw.rect(self.screen, color, input_box, border_radius=5)
             pygame.draw.rect(self.screen, self.colors.DARK_GRAY, input_box.inflate(-4, -4), border_radius=3)
             
-            txt_surface = self.font_medium.render(text, True, self.colors.WHITE)
+            txt_surface = self.text_cache.render(self.font_medium, text, True, self.colors.WHITE)
             text_y = input_box.y + (input_height - txt_surface.get_height()) // 2
             self.screen.blit(txt_surface, (input_box.x + 15, text_y))
             
-            if active and pygame.time.get_ticks() % 1000 < 500:
+            # Blink on the wall clock: pygame's ticks stay 0 without pygame.init()
+            now_ms = int(time.monotonic() * 1000)
+            if active and now_ms % (2 * blink_ms) < blink_ms:
                 cursor_x = input_box.x + 15 + txt_surface.get_width()
                 pygame.draw.line(self.screen, self.colors.WHITE, 
                                (cursor_x, input_box.y + 15),
                                (cursor_x, input_box.y + input_height - 15), 2)
             
-            pygame.display.flip()
-            self.clock.tick(30)
+            pygame.display.update(input_box)
+            
+            # Only wake up for input, or to blink the cursor
+            timeout = blink_ms - now_ms % blink_ms if active else None
+            event = self._wait_event(timeout)
+            
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                active = input_box.collidepoint(event.pos)
+                color = color_active if active else color_inactive
+                
+            if event.type == pygame.KEYDOWN and active:
+                if event.key == pygame.K_RETURN:
+                    if text.strip():
+                        done = True
+                        name_recorded = True
+                    else:
+                        return "Nameless Anon"
+                elif event.key == pygame.K_BACKSPACE:
+                    text = text[:-1]
+                elif len(text) < 15:
+                    text += event.unicode
         
         if name_recorded:
-            self.high_score_manager.add_score(text.strip() or "Nameless Anon", score)
+            try:
+                self.high_score_manager.add_score(text.strip() or "Nameless Anon", score)
+            except OSError as e:
+                print(f"High score not saved: {e}")
         return text.strip() or "Nameless Anon"
 
-class HighScoreManager:
-    """Handles high score loading and saving"""
-    def __init__(self, filename):
-        self.filename = filename
-        self.scores = []
-        self._load_scores()
-        
-    def _load_scores(self):
-        """Load scores from file"""
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r') as f:
-                self.scores = json.load(f)
-    
-    def save_scores(self):
-        """Save scores to file"""
-        with open(self.filename, 'w') as f:
-            json.dump(self.scores, f)
-    
-    def add_score(self, name, score):
-        """Add a new score and maintain top 10"""
-        self.scores.append({"name": name, "score": score})
-        self.scores.sort(key=lambda x: x["score"], reverse=True)
-        self.scores = self.scores[:10]
-        self.save_scores()
-    
-    def is_high_score(self, score):
-        """Check if score qualifies as high score"""
-        if not self.scores:
-            return True
-        return score > self.scores[-1]["score"]
+def parse_args(argv=None):
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Hebi, the transparent desktop snake")
+    parser.add_argument('--autopilot', nargs='?', const='bfs', choices=sorted(SnakeGame.AUTOPILOTS),
+                        help="let the snake play itself (default planner: bfs)")
+    parser.add_argument('--workers', type=int, default=0, metavar='N',
+                        help="with --autopilot lookahead: also search in N worker processes")
+    parser.add_argument('--stats', action='store_true',
+                        help="print startup phases, then frame time budget and idle CPU stats on quit")
+    parser.add_argument('--seed', type=int,
+                        help="seed food placement for a reproducible run")
+    parser.add_argument('--backend', choices=sorted(BACKENDS),
+                        help="window transparency backend (default: picked for the platform)")
+    parser.add_argument('--span', action='store_true',
+                        help="spread the playfield over every monitor")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each frame phase; F3 toggles an overlay, totals print on quit")
+    parser.add_argument('--profile-out', metavar='FILE',
+                        help="write the recent profiled frames to FILE (.csv or .json) on quit, implies --profile")
+    parser.add_argument('--controller', metavar='ADDRESS',
+                        help="let other programs steer over a socket: unix:PATH, tcp:HOST:PORT or a port")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="play back a recorded session in real time")
+    parser.add_argument('--verify', action='store_true',
+                        help="with --replay: re-simulate headless and check the recorded scores")
+    args = parser.parse_args(argv)
+    if args.seed is not None and not 0 <= args.seed < 2 ** 63:
+        parser.error("--seed must be between 0 and 2**63 - 1")
+    if args.workers and args.autopilot != 'lookahead':
+        parser.error("--workers needs --autopilot lookahead")
+    if args.workers < 0:
+        parser.error("--workers can't be negative")
+    if args.verify and not args.replay:
+        parser.error("--verify needs --replay FILE")
+    return args
+
+def verify_replay(path):
+    """Print the outcome of every recorded game, True if all of them check out"""
+    results = verify(path)
+    for game in results:
+        status = "ok" if game["ok"] else (
+            f"MISMATCH (simulated {game['simulated_score']} after {game['simulated_ticks']} ticks)")
+        print(f"game {game['game']}: score {game['score']} after {game['ticks']} ticks: {status}")
+    verified = [game["score"] for game in results if game["ok"]]
+    print(f"{len(verified)}/{len(results)} games verified, best score {max(verified, default=0)}")
+    return len(verified) == len(results)
 
 if __name__ == "__main__":
-    game = SnakeGame()
+    args = parse_args()
+    if args.verify:
+        sys.exit(0 if verify_replay(args.replay) else 1)
+    game = SnakeGame(autopilot=args.autopilot, report_stats=args.stats, seed=args.seed,
+                     replay=args.replay, backend=args.backend, span=args.span,
+                     profile=args.profile, profile_file=args.profile_out, controller=args.controller,
+                     workers=args.workers)
     game.run()
\ No newline at end of file
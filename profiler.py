@@ -0,0 +1,117 @@
+import csv
+import json
+import time
+from array import array
+
+
+class RingBuffer:
+    """Fixed-size float history, oldest values overwritten first"""
+    def __init__(self, size):
+        self.size = size
+        self.values = array('d', bytes(8 * size))
+        self.count = 0
+
+    def append(self, value):
+        self.values[self.count % self.size] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def ordered(self):
+        """Stored values, oldest first"""
+        if self.count <= self.size:
+            return self.values[:self.count]
+        start = self.count % self.size
+        return self.values[start:] + self.values[:start]
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the stored values"""
+        if not self.count:
+            return 0.0
+        ordered = sorted(self.values[:len(self)])
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class FrameProfiler:
+    """Per-phase frame timings kept in ring buffers
+
+    wrap() times a function into a phase. Time spent in nested wrapped
+    calls is charged to the inner phase only, so the phases of a frame
+    add up to its work. end_frame() moves the frame's totals into the
+    history and counts frames dropped since the last one.
+    """
+    PHASES = ('events', 'logic', 'food', 'snake', 'hud', 'present')
+
+    def __init__(self, budget, size=4096):
+        self.budget = budget
+        self.history = {phase: RingBuffer(size) for phase in self.PHASES + ('total',)}
+        self.frames = 0
+        self.dropped = 0
+        self._current = dict.fromkeys(self.PHASES, 0.0)
+        self._children = []
+
+    def wrap(self, phase, func):
+        """func timed into phase"""
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            self._children.append(0.0)
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                inner = self._children.pop()
+                self._current[phase] += elapsed - inner
+                if self._children:
+                    self._children[-1] += elapsed
+        return timed
+
+    def add(self, phase, seconds):
+        """Charge time measured by the caller to a phase"""
+        self._current[phase] += seconds
+
+    def end_frame(self, interval):
+        """Close a frame that took interval seconds since the previous one"""
+        work = 0.0
+        for phase, seconds in self._current.items():
+            self.history[phase].append(seconds)
+            work += seconds
+            self._current[phase] = 0.0
+        self.history['total'].append(work)
+        self.frames += 1
+        # A frame that took over 1.5 budgets on screen means at least one was skipped
+        if interval > self.budget * 1.5:
+            self.dropped += int(interval / self.budget + 0.5) - 1
+
+    def summary(self):
+        """Frame time percentiles and drops in milliseconds"""
+        frame = self.history['total']
+        return {
+            "frames": self.frames,
+            "p50_ms": frame.percentile(50) * 1000,
+            "p95_ms": frame.percentile(95) * 1000,
+            "p99_ms": frame.percentile(99) * 1000,
+            "dropped": self.dropped,
+        }
+
+    def rows(self):
+        """Recent frames, oldest first: frame number, then phase and total times in ms"""
+        columns = {name: buffer.ordered() for name, buffer in self.history.items()}
+        first = self.frames - len(self.history['total'])
+        return [dict({"frame": first + i},
+                     **{name: values[i] * 1000 for name, values in columns.items()})
+                for i in range(len(columns['total']))]
+
+    def export(self, path):
+        """Write the recent frames to a .csv file, or JSON for anything else"""
+        rows = self.rows()
+        with open(path, 'w', newline='') as f:
+            if path.lower().endswith('.csv'):
+                writer = csv.DictWriter(f, ["frame", *self.PHASES, "total"])
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump({"budget_ms": self.budget * 1000, "summary": self.summary(),
+                           "frames": rows}, f)
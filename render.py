@@ -0,0 +1,298 @@
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+from resources import match_font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces
+
+    Keyed on (font, text, antialias, color) so static strings render once
+    and dynamic ones only re-render when their value changes.
+    """
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, antialias, color):
+        """Drop-in for font.render that reuses cached surfaces"""
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._surfaces)}
+
+    def reset_stats(self):
+        """Zero the hit/miss counters"""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop every cached surface"""
+        self._surfaces.clear()
+
+
+class FontLoader:
+    """System fonts resolved once per machine and opened on first use
+
+    pygame.font.SysFont scans every font directory the first time it is
+    called. The file matched for each (name, bold) is remembered in a
+    JSON cache, so later starts open it directly, and no font is opened
+    before something draws with it. Fonts packed in the resources' bundle
+    (see resources.py) are used before any system font.
+    """
+    def __init__(self, cache_dir=None, resources=None):
+        cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.cache', 'hebi')
+        self.cache_dir = cache_dir
+        self.resources = resources
+        self.cache_file = os.path.join(cache_dir, 'fonts.json')
+        self._paths = None
+        self._fonts = {}
+
+    def get(self, name, size, bold=False):
+        """Font like pygame.font.SysFont(name, size, bold), loaded once"""
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            bundled = self.resources.font(name, bold) if self.resources else None
+            source, fake_bold = bundled or self._resolve(name, bold)
+            font = pygame.font.Font(source, size)
+            font.set_bold(fake_bold)
+            self._fonts[key] = font
+        return font
+
+    def _resolve(self, name, bold):
+        """(font file or None for pygame's default, whether to embolden it)"""
+        if self._paths is None:
+            try:
+                with open(self.cache_file) as f:
+                    self._paths = json.load(f)
+            except (OSError, ValueError):
+                self._paths = {}
+        key = f"{name}{':bold' if bold else ''}"
+        entry = self._paths.get(key)
+        if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+            return entry
+
+        self._paths[key] = entry = list(match_font(name, bold))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self._paths, f)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            pass  # A read-only cache only costs a scan next time
+        return entry
+
+
+class SpriteAtlas:
+    """Pre-rendered sprites packed into one color-keyed surface
+
+    Each name holds a list of frames (e.g. the body gradient ramp or an
+    animated mascot sheet); draws are (surface, pos, area) tuples ready
+    for Surface.blits().
+    """
+    def __init__(self, colorkey):
+        self.colorkey = colorkey
+        self.surface = None
+        self._pending = {}
+        self._areas = {}
+
+    def add(self, name, frames):
+        """Queue frames under name; call build() once everything is added"""
+        self._pending[name] = list(frames)
+
+    def add_sheet(self, name, sheet, frame_width):
+        """Queue a horizontal sprite sheet sliced into equal frames"""
+        height = sheet.get_height()
+        self.add(name, [sheet.subsurface((x, 0, frame_width, height))
+                        for x in range(0, sheet.get_width() - frame_width + 1, frame_width)])
+
+    def build(self):
+        """Pack every queued frame into the atlas surface, one row per name"""
+        rows = list(self._pending.items())
+        width = max(sum(f.get_width() for f in frames) for _, frames in rows)
+        height = sum(max(f.get_height() for f in frames) for _, frames in rows)
+
+        surface = pygame.Surface((width, height))
+        surface.fill(self.colorkey)
+        y = 0
+        for name, frames in rows:
+            x = 0
+            areas = []
+            for frame in frames:
+                areas.append(surface.blit(frame, (x, y)))
+                x += frame.get_width()
+            self._areas[name] = areas
+            y += max(f.get_height() for f in frames)
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_colorkey(self.colorkey, pygame.RLEACCEL)
+        self.surface = surface
+        self._pending = {}
+        return self
+
+    def frame_count(self, name):
+        return len(self._areas[name])
+
+    def area(self, name, frame=0):
+        """Atlas rect of a frame; frame indices wrap for looping animations"""
+        areas = self._areas[name]
+        return areas[frame % len(areas)]
+
+    def blit_args(self, name, frame, pos):
+        """(surface, pos, area) tuple for Surface.blits()"""
+        return self.surface, pos, self.area(name, frame)
+
+    def draw(self, target, name, frame, pos):
+        """Blit a single frame"""
+        return target.blit(self.surface, pos, self.area(name, frame))
+
+
+class OverlayManager:
+    """Modal screens rendered once per resolution and reused
+
+    Builders draw onto a fresh surface the first time a screen is
+    needed. Translucent overlays get a per-pixel alpha surface that is
+    blended over the current frame; opaque ones replace it.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._builders = {}
+        self._surfaces = {}
+
+    def register(self, name, builder, translucent=False):
+        """Add a screen; builder(surface) paints it"""
+        self._builders[name] = (builder, translucent)
+        self._surfaces.pop(name, None)
+
+    def get(self, name):
+        """Surface for a screen, building it on first use"""
+        surface = self._surfaces.get(name)
+        if surface is None:
+            builder, translucent = self._builders[name]
+            if translucent:
+                surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            else:
+                surface = pygame.Surface(self.size)
+            builder(surface)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha() if translucent else surface.convert()
+            self._surfaces[name] = surface
+        return surface
+
+    def blit(self, target, name, pos=(0, 0)):
+        """Draw a screen over target, returns the affected rect"""
+        return target.blit(self.get(name), pos)
+
+    def resize(self, size):
+        """Drop every built screen after a resolution change"""
+        self.size = size
+        self._surfaces.clear()
+
+
+class Compositor:
+    """Playfield and HUD layers composited onto the screen tile by tile
+
+    The playfield is drawn into `board`, a screen-sized surface, and each
+    HUD layer is a cached list of (surface, rect) blits. Drawing on the
+    board or replacing a layer only marks the fixed-size tiles it
+    touches; composite() rebuilds just those tiles on the target, board
+    first and then the layers in the order they were first set, so the
+    cost of a frame follows the tiles that changed, not the resolution.
+    """
+    def __init__(self, target, tile=64):
+        self.target = target
+        self.bounds = target.get_rect()
+        self.board = pygame.Surface(self.bounds.size, 0, target)
+        self.tile = tile
+        self.tiles_x = -(-self.bounds.width // tile)
+        self.tiles_y = -(-self.bounds.height // tile)
+        self._dirty = bytearray(self.tiles_x * self.tiles_y)
+        self._pending = []
+        self.layers = {}
+
+    def invalidate(self, rect):
+        """Mark every tile rect overlaps for rebuilding"""
+        rect = self.bounds.clip(rect)
+        if not rect.width or not rect.height:
+            return
+        tile, dirty, pending = self.tile, self._dirty, self._pending
+        for ty in range(rect.top // tile, (rect.bottom - 1) // tile + 1):
+            row = ty * self.tiles_x
+            for index in range(row + rect.left // tile, row + (rect.right - 1) // tile + 1):
+                if not dirty[index]:
+                    dirty[index] = 1
+                    pending.append(index)
+
+    def set_layer(self, name, blits):
+        """Replace a layer's (surface, pos) blits, returns their bounding rect or None"""
+        old = self.layers.get(name)
+        items = [(surface, surface.get_rect(topleft=pos)) for surface, pos in blits]
+        if old and old[1] == items:
+            return old[0]  # Unchanged, nothing to rebuild
+        if old and old[0]:
+            self.invalidate(old[0])
+        area = items[0][1].unionall([rect for _, rect in items[1:]]) if items else None
+        self.layers[name] = (area, items)
+        if area:
+            self.invalidate(area)
+        return area
+
+    def draw_layers(self, *names):
+        """Blit the named layers straight onto the target, e.g. over a modal screen"""
+        for name in names:
+            layer = self.layers.get(name)
+            if layer and layer[0]:
+                self.target.blits(layer[1], doreturn=False)
+
+    def composite(self):
+        """Rebuild the dirty tiles on the target, returns the rects to present
+
+        Dirty tiles next to each other on a tile row are merged into one rect.
+        """
+        if not self._pending:
+            return []
+        tile, tiles_x = self.tile, self.tiles_x
+        runs = []
+        for index in sorted(self._pending):
+            if runs and runs[-1][1] == index and index % tiles_x:
+                runs[-1][1] = index + 1
+            else:
+                runs.append([index, index + 1])
+            self._dirty[index] = 0
+        self._pending = []
+
+        target, board, bounds = self.target, self.board, self.bounds
+        layers = [layer for layer in self.layers.values() if layer[0]]
+        rects = []
+        for start, end in runs:
+            ty, tx = divmod(start, tiles_x)
+            rect = bounds.clip(tx * tile, ty * tile, (end - start) * tile, tile)
+            target.blit(board, rect, rect)
+            for area, items in layers:
+                if area.colliderect(rect):
+                    target.set_clip(rect)
+                    target.blits(items, doreturn=False)
+                    target.set_clip(None)
+            rects.append(rect)
+        return rects
@@ -0,0 +1,265 @@
+import mmap
+import os
+import struct
+
+from engine import SnakeEngine, DIRECTIONS
+
+# File layout: header, wall cells, then a stream of events. Walls are a
+# varint run count and (gap, length) varint pairs over the sorted cells
+# (version 1 files have none). Each event is a varint key (ticks since
+# the previous event of the same game << 3 | code), GAME_OVER is followed
+# by a varint score.
+MAGIC = b'HEBR'
+VERSION = 2
+_HEADER = struct.Struct('<4sBQHHHH')  # magic, version, seed, cols, rows, block, speed
+
+# Codes 0-3 are turns into engine.DIRECTIONS[code]
+GAME_OVER = 4
+END = 5
+
+_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+
+def _varint(value):
+    """Unsigned LEB128 encoding of value"""
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _wall_runs(walls):
+    """Sorted cells as (gap since the previous run, run length) pairs"""
+    runs = []
+    end = 0
+    for cell in sorted(walls):
+        if runs and cell == end:
+            runs[-1][1] += 1
+        else:
+            runs.append([cell - end, 1])
+        end = cell + 1
+    return runs
+
+
+def _read_varint(buf, pos):
+    """Decode a varint at pos, returns (value, next pos); raises EOFError if cut short"""
+    value = shift = 0
+    while True:
+        if pos >= len(buf):
+            raise EOFError
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayWriter:
+    """Streams a session to disk: the seed and settings, then only the turns
+
+    The engine is deterministic for a given seed, so accepted direction
+    changes and the tick they happened on are enough to rebuild every
+    game. Game overs carry the score so a replay can be verified. The
+    file is created on the first event, so a session that never plays
+    leaves none behind, and flushed at every game over so a crash loses
+    at most the game in progress. An existing file is never overwritten:
+    if path is taken a -1, -2, ... suffix is added, and path is updated
+    to the name actually used.
+    """
+    def __init__(self, path, seed, cols, rows, snake_block, snake_speed, walls=()):
+        self.path = path
+        header = [_HEADER.pack(MAGIC, VERSION, seed, cols, rows, snake_block, snake_speed)]
+        runs = _wall_runs(walls)
+        header.append(_varint(len(runs)))
+        for gap, length in runs:
+            header.append(_varint(gap) + _varint(length))
+        self._header = b''.join(header)
+        self._file = None
+        self._failed = False
+        self._last = 0
+
+    def _write(self, data):
+        if self._file is None:
+            if self._failed:
+                return
+            try:
+                self._file = self._create()
+                self._file.write(self._header)
+            except OSError as e:
+                print(f"Replay not recorded: {e}")
+                self._failed = True
+                return
+        self._file.write(data)
+
+    def _create(self):
+        stem, ext = os.path.splitext(self.path)
+        path, n = self.path, 0
+        while True:
+            try:
+                f = open(path, 'xb')
+            except FileExistsError:
+                n += 1
+                path = f"{stem}-{n}{ext}"
+                continue
+            self.path = path
+            return f
+
+    def _event(self, tick, code):
+        self._write(_varint((tick - self._last) << 3 | code))
+        self._last = tick
+
+    def turn(self, tick, direction):
+        """Record a turn applied before the step that takes ticks to tick + 1"""
+        self._event(tick, _CODES[direction])
+
+    def game_over(self, tick, score):
+        """Record a game ending on tick and flush it; the next game counts from zero"""
+        self._event(tick, GAME_OVER)
+        self._write(_varint(score))
+        self._last = 0
+        if self._file:
+            self._file.flush()
+
+    def close(self, tick):
+        """Mark where the session stopped and close the file, if one was started"""
+        if self._file is None or self._file.closed:
+            return
+        self._event(tick, END)
+        self._file.close()
+
+
+class ReplayReader:
+    """Memory-mapped replay file; events are decoded lazily as they are read"""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files can't be mapped
+            self._file.close()
+            raise ValueError(f"{path}: not a hebi replay")
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: not a hebi replay")
+        magic, version, self.seed, self.cols, self.rows, self.snake_block, self.snake_speed = (
+            _HEADER.unpack_from(self._map))
+        if magic != MAGIC or not 1 <= version <= VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a hebi replay (or an unsupported version)")
+        self.walls = []
+        self._start = _HEADER.size
+        if version >= 2:
+            try:
+                self._read_walls()
+            except EOFError:
+                self.close()
+                raise ValueError(f"{path}: truncated replay header")
+
+    def _read_walls(self):
+        buf = self._map
+        count, pos = _read_varint(buf, self._start)
+        end = 0
+        for _ in range(count):
+            gap, pos = _read_varint(buf, pos)
+            length, pos = _read_varint(buf, pos)
+            end += gap
+            self.walls.extend(range(end, end + length))
+            end += length
+        self._start = pos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def events(self):
+        """Yield (tick, code, score) with ticks counted from each game's start
+
+        score is only set for GAME_OVER. A file cut short by a crash simply
+        ends after its last complete event.
+        """
+        buf = self._map
+        pos = self._start
+        tick = 0
+        try:
+            while pos < len(buf):
+                key, pos = _read_varint(buf, pos)
+                tick += key >> 3
+                code = key & 7
+                if code == GAME_OVER:
+                    score, pos = _read_varint(buf, pos)
+                    yield tick, code, score
+                    tick = 0
+                    continue
+                yield tick, code, None
+                if code == END:
+                    return
+        except EOFError:
+            return
+
+
+class ReplayPlayer:
+    """Feeds recorded turns back to a live game tick by tick"""
+    def __init__(self, reader):
+        self.reader = reader
+        self._events = reader.events()
+        self._pending = next(self._events, None)
+
+    def turn_at(self, tick):
+        """Direction recorded for the step after tick, or None"""
+        pending = self._pending
+        if pending and pending[0] == tick and pending[1] < GAME_OVER:
+            self._pending = next(self._events, None)
+            return DIRECTIONS[pending[1]]
+        return None
+
+    def at_end(self, tick):
+        """Whether the recording stopped at tick of the current game"""
+        pending = self._pending
+        return pending is None or (pending[1] == END and tick >= pending[0])
+
+    def next_game(self):
+        """Skip past the current game; False once the recording has ended"""
+        while self._pending and self._pending[1] < GAME_OVER:
+            self._pending = next(self._events, None)
+        if self._pending and self._pending[1] == GAME_OVER:
+            self._pending = next(self._events, None)
+        return self._pending is not None and self._pending[1] != END
+
+
+def verify(path):
+    """Re-simulate every game in a replay as fast as possible
+
+    Returns one dict per finished game with the recorded and simulated
+    ticks and score and whether they match.
+    """
+    results = []
+    with ReplayReader(path) as reader:
+        engine = SnakeEngine(reader.cols, reader.rows, seed=reader.seed, walls=reader.walls)
+        step = engine.step
+        for tick, code, score in reader.events():
+            while engine.ticks < tick and step():
+                pass
+            if code < GAME_OVER:
+                engine.turn(DIRECTIONS[code])
+            elif code == GAME_OVER:
+                results.append({
+                    "game": len(results) + 1,
+                    "ticks": tick,
+                    "score": score,
+                    "simulated_ticks": engine.ticks,
+                    "simulated_score": engine.score,
+                    "ok": not engine.alive and engine.ticks == tick and engine.score == score,
+                })
+                engine.reset()
+            else:
+                break
+    return results
@@ -0,0 +1,250 @@
+"""Read-only game resources and where the game keeps its files
+
+Resources can be packed into one bundle, hebi.pak, found next to the
+executable, in PyInstaller's unpack directory or next to the source.
+The bundle is memory-mapped the first time something is loaded from it,
+and its entries are ready to use without decoding: the icon as raw RGBA
+pixels, fonts as the font files matched on the build machine. Without a
+bundle the same loose files are looked up in those directories.
+
+    python resources.py
+    python resources.py --font Arial:bold=fonts/DejaVuSans-Bold.ttf --output dist/hebi.pak
+
+Pack only fonts you may redistribute with the game; --font overrides
+the file picked for a (name, bold) pair.
+"""
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+# File layout: header, a JSON index of name -> {offset, length, ...} and
+# then the entries' bytes. Offsets are relative to the data, which starts
+# on an 8 byte boundary after the index.
+MAGIC = b'HEBP'
+VERSION = 1
+_HEADER = struct.Struct('<4sBI')  # magic, version, index length
+_ALIGN = 8
+
+BUNDLE_NAME = 'hebi.pak'
+ICON_SIZE = 256  # Longest side of a packed icon, as large as window icons get
+FONTS = (('Arial', False), ('Arial', True))  # Every (name, bold) the game draws with
+
+
+def app_dir():
+    """Directory of the executable when frozen, else of the source"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def resource_dirs():
+    """Directories read-only resources are looked up in, in order"""
+    dirs = [app_dir()]
+    unpacked = getattr(sys, '_MEIPASS', None)  # PyInstaller's bundled data
+    if unpacked and unpacked not in dirs:
+        dirs.append(unpacked)
+    return dirs
+
+
+def match_font(name, bold=False):
+    """(system font file or None, whether to embolden it), as SysFont picks them"""
+    path = pygame.font.match_font(name, bold=bold)
+    # Without a bold face the regular one is emboldened, as SysFont does
+    fake_bold = bold and (path is None or path == pygame.font.match_font(name))
+    return path, fake_bold
+
+
+def _font_key(name, bold):
+    return f"font/{name}{':bold' if bold else ''}"
+
+
+class ResourceBundle:
+    """Resources packed into one file, mapped into memory on first use
+
+    data() returns views into the mapping, so nothing is read from disk
+    until it is touched and nothing is copied to get at it.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._index = None
+        self._base = 0
+
+    def _open(self):
+        if self._index is None:
+            with open(self.path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if len(data) < _HEADER.size:
+                    raise ValueError("not a hebi resource bundle")
+                magic, version, length = _HEADER.unpack_from(data)
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError("not a hebi resource bundle (or an unsupported version)")
+                index = json.loads(data[_HEADER.size:_HEADER.size + length])
+            except ValueError as e:
+                data.close()
+                raise ValueError(f"{self.path}: {e}") from None
+            self._map = data
+            self._base = -(-(_HEADER.size + length) // _ALIGN) * _ALIGN
+            self._index = index
+        return self._index
+
+    def __contains__(self, name):
+        return name in self._open()
+
+    def meta(self, name):
+        """An entry's index record: offset, length and loader details"""
+        return self._open()[name]
+
+    def data(self, name):
+        """An entry's bytes as a read-only memoryview"""
+        entry = self._open()[name]
+        start = self._base + entry["offset"]
+        return memoryview(self._map)[start:start + entry["length"]]
+
+    @staticmethod
+    def write(path, entries):
+        """Pack (name, meta, bytes) entries into a bundle at path, atomically"""
+        index = {}
+        offset = 0
+        for name, meta, data in entries:
+            index[name] = dict(meta, offset=offset, length=len(data))
+            offset += -(-len(data) // _ALIGN) * _ALIGN
+        encoded = json.dumps(index, separators=(',', ':')).encode()
+        head = _HEADER.pack(MAGIC, VERSION, len(encoded)) + encoded
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(head.ljust(-(-len(head) // _ALIGN) * _ALIGN, b'\0'))
+            for name, meta, data in entries:
+                f.write(data)
+                f.write(bytes(-len(data) % _ALIGN))
+        os.replace(tmp, path)
+
+
+class Resources:
+    """The game's files, found wherever it was started from
+
+    Read-only resources come from the bundle when there is one and from
+    loose files otherwise. Files the game writes (scores, replays, the
+    suspended game) live in data_dir, by default the executable's or the
+    source's directory, so they do not depend on the working directory.
+    dirs replaces resource_dirs() as the places resources are looked up.
+    """
+    def __init__(self, data_dir=None, dirs=None, bundle_name=BUNDLE_NAME):
+        self.data_dir = data_dir or app_dir()
+        self.dirs = dirs or resource_dirs()
+        self.bundle_name = bundle_name
+        self._bundle = False  # Not looked for yet
+
+    @property
+    def bundle(self):
+        """The ResourceBundle, or None if there is no usable one"""
+        if self._bundle is False:
+            self._bundle = None
+            path = self.find(self.bundle_name)
+            if path:
+                bundle = ResourceBundle(path)
+                try:
+                    bundle._open()
+                    self._bundle = bundle
+                except (OSError, ValueError) as e:
+                    print(f"Resource bundle not used: {e}")
+        return self._bundle
+
+    def find(self, name):
+        """Path of a read-only file in the first directory that has it, or None"""
+        for directory in self.dirs:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def data_path(self, name):
+        """Where a file the game writes lives; absolute names are kept"""
+        return os.path.join(self.data_dir, name)
+
+    def icon(self, name):
+        """Window icon surface, or None if there is none"""
+        key = f"image/{name}"
+        bundle = self.bundle
+        if bundle and key in bundle:
+            meta = bundle.meta(key)
+            return pygame.image.frombuffer(bundle.data(key), meta["size"], meta["format"])
+        path = self.find(name)
+        return pygame.image.load(path) if path else None
+
+    def font(self, name, bold=False):
+        """(file object, fake bold) of a bundled font, or None
+
+        The file object goes to pygame.font.Font; open one per size.
+        """
+        key = _font_key(name, bold)
+        bundle = self.bundle
+        if not bundle or key not in bundle:
+            return None
+        return io.BytesIO(bundle.data(key)), bundle.meta(key)["fake_bold"]
+
+
+def build(path, icon='icon.png', fonts=FONTS, font_files=None):
+    """Pack the icon and fonts into a bundle at path, returns the entry names
+
+    font_files maps (name, bold) to a font file to pack instead of the
+    one pygame matches on this machine.
+    """
+    font_files = font_files or {}
+    entries = []
+    if icon:
+        image = pygame.image.load(icon)
+        scale = min(1.0, ICON_SIZE / max(image.get_size()))
+        if scale < 1.0:
+            size = (max(1, round(image.get_width() * scale)), max(1, round(image.get_height() * scale)))
+            rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)  # smoothscale needs 32 bits
+            rgba.blit(image, (0, 0))
+            image = pygame.transform.smoothscale(rgba, size)
+        entries.append((f"image/{os.path.basename(icon)}",
+                        {"size": list(image.get_size()), "format": "RGBA"},
+                        pygame.image.tobytes(image, 'RGBA')))
+    for name, bold in fonts:
+        font_file, fake_bold = font_files.get((name, bold)), False
+        if not font_file:
+            font_file, fake_bold = match_font(name, bold)
+        if font_file is None:
+            print(f"{name}{' bold' if bold else ''}: no font file found, left to the system at run time")
+            continue
+        with open(font_file, 'rb') as f:
+            entries.append((_font_key(name, bold), {"fake_bold": fake_bold, "source": os.path.basename(font_file)},
+                            f.read()))
+    ResourceBundle.write(path, entries)
+    return [name for name, _, _ in entries]
+
+
+def _parse_font(text):
+    """'Arial:bold=path.ttf' -> ((name, bold), path)"""
+    key, sep, path = text.partition('=')
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(f"font must look like NAME[:bold]=FILE, not {text!r}")
+    name, _, style = key.partition(':')
+    return (name, style == 'bold'), path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the icon and fonts into a resource bundle")
+    parser.add_argument('--output', default=os.path.join(app_dir(), BUNDLE_NAME),
+                        help="bundle to write (default: hebi.pak next to the game)")
+    parser.add_argument('--icon', default=os.path.join(app_dir(), 'icon.png'))
+    parser.add_argument('--font', type=_parse_font, action='append', default=[], metavar='NAME[:bold]=FILE',
+                        help="pack FILE for a font instead of the system's match, repeatable")
+    args = parser.parse_args(argv)
+    pygame.font.init()
+    names = build(args.output, args.icon, font_files=dict(args.font))
+    print(f"{args.output}: {', '.join(names)} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
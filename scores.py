@@ -0,0 +1,253 @@
+import heapq
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on a sidecar file, shared by every game instance"""
+    with open(path + '.lock', 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class HighScoreManager:
+    """High scores kept in an append-only log with an in-memory top-K heap
+
+    Every score is appended to the file as one JSON line and fsynced, so a
+    crash can at worst lose a torn last line, which loading skips. A
+    min-heap of the best `size` entries makes is_high_score a comparison
+    against its root and add_score O(log size). Once the log grows well
+    past what it needs to hold, it is compacted into a fresh file that
+    atomically replaces it. Several instances may share one file: writes
+    happen under a lock and refresh() picks up other instances' scores.
+
+    The old format, a single JSON list, is read as the first line of the
+    log and disappears at the next compaction.
+    """
+    # Compact once the log holds this many times the lines worth keeping
+    COMPACT_RATIO = 4
+
+    def __init__(self, filename, size=10):
+        self.filename = filename
+        self.size = size
+        self._load_scores()
+
+    def _load_scores(self):
+        """Rebuild the index from the whole log"""
+        self._heap = []  # (score, -seq, name), worst entry at the root
+        self._bests = {}
+        self._seq = 0
+        self._lines = 0
+        self._offset = 0
+        self._inode = None
+        self._sorted = None
+        self._read_new()
+
+    def _read_new(self):
+        """Index lines appended since the last read; False if the file was replaced"""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return True
+        if self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._offset):
+            return False
+        self._inode = stat.st_ino
+        with open(self.filename, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Leave a torn last line for the next read, it may still be in flight
+        end = data.rfind(b'\n') + 1
+        if not data.endswith(b'\n') and data.lstrip().startswith(b'['):
+            end = len(data)  # Old single-list file without a newline
+        for line in data[:end].splitlines():
+            self._index_line(line)
+        self._offset += end
+        return True
+
+    def _index_line(self, line):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return  # Torn write from a crash
+        self._lines += 1
+        for item in entry if isinstance(entry, list) else [entry]:
+            self._insert(item["name"], item["score"])
+
+    def _insert(self, name, score):
+        self._seq += 1
+        item = (score, -self._seq, name)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+        else:
+            item = None
+        if item:
+            self._sorted = None
+        if score > self._bests.get(name, -1):
+            self._bests[name] = score
+
+    def refresh(self):
+        """Pick up scores other instances wrote since the last look"""
+        if not self._read_new():
+            self._load_scores()
+
+    @property
+    def scores(self):
+        """Top entries, best first, as {"name", "score"} dicts"""
+        if self._sorted is None:
+            self._sorted = [{"name": name, "score": score}
+                            for score, _, name in sorted(self._heap, reverse=True)]
+        return self._sorted
+
+    def best(self, name):
+        """Best score of a player, or None"""
+        return self._bests.get(name)
+
+    def add_score(self, name, score):
+        """Append a score to the log and index it"""
+        line = json.dumps({"name": name, "score": score}).encode() + b'\n'
+        with _file_lock(self.filename):
+            self.refresh()
+            with open(self.filename, 'a+b') as f:
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line  # Don't glue onto a torn or old-format line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                self._offset = f.tell()
+            self._index_line(line.strip())
+            if self._lines > self.COMPACT_RATIO * (self.size + len(self._bests)):
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the log with just the top entries and per-player bests
+
+        Called with the lock held. The new file is fsynced before it
+        atomically replaces the old one.
+        """
+        # Oldest first so equal scores keep their rank; bests that fell out
+        # of the top entries go last and can't displace anything on reload
+        entries = [(name, score) for score, _, name in sorted(self._heap, key=lambda item: -item[1])]
+        kept = set(entries)
+        entries += [entry for entry in self._bests.items() if entry not in kept]
+        tmp = f"{self.filename}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            for name, score in entries:
+                f.write(json.dumps({"name": name, "score": score}).encode() + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+        self._load_scores()
+
+    def is_high_score(self, score):
+        """Check if score qualifies as high score"""
+        return len(self._heap) < self.size or score > self._heap[0][0]
+
+
+class Leaderboard:
+    """Every finished game in a local SQLite database
+
+    Rows are never deleted, so the highest id doubles as the row count.
+    Indexes on score and on (name, score) keep top-N, player-best and
+    percentile-rank queries to index lookups however many bot games pile
+    up. top() results are cached until this instance records a game.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            score INTEGER NOT NULL,
+            length INTEGER,
+            duration REAL,
+            seed INTEGER,
+            played_at REAL,
+            autopilot TEXT
+        );
+        CREATE INDEX IF NOT EXISTS games_score ON games (score DESC, id);
+        CREATE INDEX IF NOT EXISTS games_name_score ON games (name, score DESC);
+        CREATE INDEX IF NOT EXISTS games_autopilot_score ON games (autopilot, score DESC, id);
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(self.SCHEMA)
+        self._top = {}
+
+    def close(self):
+        self.db.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+
+    def record(self, score, name=None, length=None, duration=None, seed=None, autopilot=None,
+               played_at=None):
+        """Commit one finished game; autopilot is the planner name, None for a human"""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO games (name, score, length, duration, seed, played_at, autopilot)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, score, length, duration, seed,
+                 time.time() if played_at is None else played_at, autopilot))
+        self._top.clear()
+
+    def import_scores(self, entries):
+        """Seed an empty history with existing {"name", "score"} entries"""
+        if len(self):
+            return
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO games (name, score) VALUES (?, ?)",
+                [(entry["name"], entry["score"]) for entry in entries])
+        self._top.clear()
+
+    def top(self, limit=10, offset=0, human=None):
+        """Best games as (name, score) rows, best and oldest first
+
+        human=True keeps only human games, False only autopilot ones.
+        """
+        key = (limit, offset, human)
+        if key not in self._top:
+            where = {None: "", True: " WHERE autopilot IS NULL", False: " WHERE autopilot IS NOT NULL"}
+            self._top[key] = self.db.execute(
+                f"SELECT name, score FROM games{where[human]} ORDER BY score DESC, id"
+                " LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return self._top[key]
+
+    def player_best(self, name):
+        """Best score of a player, or None"""
+        return self.db.execute("SELECT MAX(score) FROM games WHERE name = ?", (name,)).fetchone()[0]
+
+    def percentile_rank(self, score):
+        """Share of recorded games (0-100) that scored below score"""
+        total = len(self)
+        if not total:
+            return 100.0
+        below = self.db.execute("SELECT COUNT(*) FROM games WHERE score < ?", (score,)).fetchone()[0]
+        return below / total * 100
@@ -0,0 +1,209 @@
+import os
+import struct
+import sys
+from array import array
+
+from engine import SnakeEngine
+
+# File layout: header, then the state array in the byte order the header
+# names. The array holds the fields below, the 625 Mersenne Twister words
+# of the food generator and then the wall, body (tail to head) and free
+# cells, their counts being fields.
+MAGIC = b'HEBS'
+VERSION = 1
+_HEADER = struct.Struct('<4sBB')  # magic, version, 1 if little endian
+_FIELDS = ('cols', 'rows', 'seed', 'dx', 'dy', 'length', 'score', 'food', 'alive', 'death',
+           'ticks', 'start', 'walls', 'body', 'free', 'gauss')
+_INDEX = {name: i for i, name in enumerate(_FIELDS)}
+_RNG_WORDS = 625
+_CELLS = len(_FIELDS) + _RNG_WORDS
+
+DEATHS = (None, 'wall', 'self', 'won')
+_NO_GAUSS = -1  # gauss field when the generator holds no spare gauss() value
+
+
+class GameState:
+    """A game packed into one int64 array: copy, save and restore it whole
+
+    Besides the rules' fields it keeps the food generator and the order
+    of the free cell index, so a restored game plays on exactly like the
+    one that was captured. copy() is a single array copy and buffer() a
+    zero-copy view of the bytes that save() writes.
+    """
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = values
+
+    @classmethod
+    def capture(cls, engine, seed=None):
+        """Snapshot of an engine; seed is kept for reference only"""
+        snake = engine.snake
+        free = snake.free
+        version, words, gauss = engine.rng.getstate()
+        values = array('q', bytes(8 * len(_FIELDS)))
+        fields = {
+            'cols': engine.cols, 'rows': engine.rows, 'seed': -1 if seed is None else seed,
+            'dx': engine.dx, 'dy': engine.dy, 'length': engine.length, 'score': engine.score,
+            'food': -1 if engine.food is None else engine.food, 'alive': engine.alive,
+            'death': DEATHS.index(engine.death), 'ticks': engine.ticks, 'start': engine.start,
+            'walls': len(engine.walls), 'body': len(snake), 'free': len(free),
+            'gauss': _NO_GAUSS if gauss is None else struct.unpack('<q', struct.pack('<d', gauss))[0],
+        }
+        for name, value in fields.items():
+            values[_INDEX[name]] = value
+        values.extend(words)
+        values.extend(engine.walls)
+        values.extend(snake.body)
+        values.extend(iter(free.cells[:free.size]))  # Different typecode, extend item by item
+        return cls(values)
+
+    def __getattr__(self, name):
+        """Fields by name, e.g. state.score"""
+        if name not in _INDEX:
+            raise AttributeError(name)
+        return self.values[_INDEX[name]]
+
+    def _section(self, offset, count):
+        return self.values[_CELLS + offset:_CELLS + offset + count]
+
+    @property
+    def wall_cells(self):
+        return self._section(0, self.walls)
+
+    @property
+    def body_cells(self):
+        """Snake cells from tail to head"""
+        return self._section(self.walls, self.body)
+
+    @property
+    def free_cells(self):
+        return self._section(self.walls + self.body, self.free)
+
+    def copy(self):
+        return GameState(self.values[:])
+
+    def matches(self, cols, rows, walls):
+        """Whether the state was captured on this board"""
+        return (self.cols, self.rows) == (cols, rows) and sorted(self.wall_cells) == sorted(walls)
+
+    def restore(self, engine):
+        """Put an engine on the same board into the captured state"""
+        if not self.matches(engine.cols, engine.rows, engine.walls):
+            raise ValueError("saved game was played on a different board")
+        snake = engine.snake
+        snake.clear()
+        body = self.body_cells
+        for cell in body:
+            snake.move(cell, len(body))
+        # Same free cells, put back in the captured slot order with the
+        # taken ones after them
+        free = snake.free
+        cells, index = free.cells, free.index
+        slot = 0
+        for section in (self.free_cells, self.wall_cells, body):
+            for cell in section:
+                cells[slot] = cell
+                index[cell] = slot
+                slot += 1
+
+        engine.dx, engine.dy = self.dx, self.dy
+        engine.length = self.length
+        engine.score = self.score
+        engine.food = None if self.food < 0 else self.food
+        engine.alive = bool(self.alive)
+        engine.death = DEATHS[self.death]
+        engine.ticks = self.ticks
+        engine.vacated = None
+        engine.ate = False
+        gauss = None if self.gauss == _NO_GAUSS else struct.unpack('<d', struct.pack('<q', self.gauss))[0]
+        words = self.values[len(_FIELDS):_CELLS]
+        engine.rng.setstate((3, tuple(words), gauss))
+
+    def to_engine(self):
+        """Fresh engine in the captured state"""
+        engine = SnakeEngine(self.cols, self.rows, walls=self.wall_cells)
+        self.restore(engine)
+        return engine
+
+    def buffer(self):
+        """The state's bytes, in native order, without copying them"""
+        return memoryview(self.values).cast('B')
+
+    @classmethod
+    def from_buffer(cls, data, little_endian=sys.byteorder == 'little'):
+        """State from bytes buffer() returned, possibly on another machine"""
+        values = array('q')
+        values.frombytes(data)
+        if little_endian != (sys.byteorder == 'little'):
+            values.byteswap()
+        if len(values) < _CELLS or len(values) != _CELLS + sum(
+                values[_INDEX[name]] for name in ('walls', 'body', 'free')):
+            raise ValueError("not a complete hebi game state")
+        return cls(values)
+
+    def header(self):
+        """File header for the state's buffer()"""
+        return _HEADER.pack(MAGIC, VERSION, sys.byteorder == 'little')
+
+    def pack(self):
+        """Header and state as one bytes object, e.g. to send over a socket"""
+        return self.header() + self.buffer()
+
+    @classmethod
+    def unpack(cls, data):
+        """State from pack() or file contents; raises ValueError for anything else"""
+        if len(data) < _HEADER.size:
+            raise ValueError("not a hebi game state")
+        magic, version, little_endian = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a hebi game state (or an unsupported version)")
+        return cls.from_buffer(memoryview(data)[_HEADER.size:], bool(little_endian))
+
+    def save(self, path):
+        """Write the state to path atomically"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(self.header())
+            f.write(self.buffer())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """State saved at path; raises ValueError for anything else"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            return cls.unpack(data)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+
+
+def suspend(engine, path, seed=None):
+    """Save a running game to resume() later"""
+    GameState.capture(engine, seed).save(path)
+
+
+def resume(engine, path):
+    """Continue a suspended game in engine and delete the file
+
+    Returns the state, or None if there is no usable game for this board.
+    """
+    try:
+        state = GameState.load(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Suspended game not resumed: {e}")
+        return None
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    if not state.alive or not state.matches(engine.cols, engine.rows, engine.walls):
+        return None
+    state.restore(engine)
+    return state
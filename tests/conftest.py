@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+# The game's modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autopilot import BFSPlanner
+from engine import SnakeEngine
+
+
+class Board:
+    """A small board with walls, the one the game tests play on"""
+    cols, rows = 12, 9
+    walls = (14, 15, 16, 40, 53, 66)
+
+    def engine(self, seed=None):
+        return SnakeEngine(self.cols, self.rows, seed=seed, walls=self.walls)
+
+    def planner(self):
+        return BFSPlanner(self.cols, self.rows, walls=self.walls)
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+@pytest.fixture
+def played(board):
+    """played(ticks, seed) -> (engine, planner) some way into a BFS game"""
+    def play(ticks=300, seed=5):
+        engine, planner = board.engine(seed), board.planner()
+        while engine.ticks < ticks and engine.step(planner.decide(engine)):
+            pass
+        return engine, planner
+    return play
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batch_env import KEEP, BatchSnakeEnv
+from engine import DIRECTIONS, SnakeEngine
+
+
+def test_follows_engine_rules():
+    cols, rows, n = 8, 6, 4
+    env = BatchSnakeEnv(n, cols, rows, seed=3)
+    engines = [SnakeEngine(cols, rows, seed=i) for i in range(n)]
+    rng = random.Random(11)
+
+    def sync_food(i):
+        # Food is the one random part; the engine takes the batch's
+        x, y = env.food[i]
+        assert not engines[i].snake.grid[y * cols + x]
+        engines[i].food = y * cols + x
+
+    for i in range(n):
+        sync_food(i)
+    games = 0
+    for _ in range(3000):
+        actions = [rng.randrange(len(DIRECTIONS)) if rng.random() < 0.3 else KEEP for _ in range(n)]
+        before = [engine.score for engine in engines]
+        rewards, dones = env.step(np.array(actions))
+        for i, engine in enumerate(engines):
+            alive = engine.step(DIRECTIONS[actions[i]] if actions[i] != KEEP else None)
+            assert dones[i] == (not alive)
+            assert rewards[i] == engine.score - before[i]
+            if not alive:
+                assert env.final_score[i] == engine.score
+                assert env.final_length[i] == len(engine.snake)
+                engine.reset()
+                games += 1
+            assert engine.head == tuple(env.heads[i])
+            assert engine.direction == tuple(env.direction[i])
+            assert engine.score == env.score[i]
+            cells = np.flatnonzero(env.grid[i].ravel())
+            assert sorted(engine.snake) == cells.tolist()
+            sync_food(i)
+    assert games > 10
+
+
+def test_food_lands_on_free_cells():
+    env = BatchSnakeEnv(300, 5, 4, seed=1)
+    env.grid[:] = 1
+    env.grid[:100, 2, 3] = 0  # One free cell
+    env.grid[100:200, 0, :2] = 0  # Two
+    idx = np.arange(300)
+    cells, full = env._place_food(idx)
+    assert (cells[:100] == (3, 2)).all()
+    assert set(map(tuple, cells[100:200].tolist())) == {(0, 0), (1, 0)}
+    assert not full[:200].any() and full[200:].all()
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from controls import ControllerClient, SocketController, TurnQueue, parse_address
+from engine import DOWN, LEFT, RIGHT, UP
+
+
+def wait_for(condition, timeout=2.0):
+    end = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_parse_address():
+    assert parse_address('unix:/tmp/hebi.sock') == ('unix', '/tmp/hebi.sock')
+    assert parse_address('tcp:0.0.0.0:4000') == ('tcp', ('0.0.0.0', 4000))
+    assert parse_address('4000') == ('tcp', ('127.0.0.1', 4000))
+    with pytest.raises(ValueError):
+        parse_address('70000')
+
+
+def test_turn_queue_applies_the_reversal_guard():
+    turns = TurnQueue(2)
+    assert turns.push(UP, RIGHT)
+    assert not turns.push(DOWN, RIGHT)  # Would reverse the queued UP
+    assert turns.push(LEFT, RIGHT)
+    assert not turns.push(DOWN, RIGHT)  # Full
+    assert (turns.pop(), turns.pop(), turns.pop()) == (UP, LEFT, None)
+
+
+def test_failed_start_raises_instead_of_hanging(monkeypatch):
+    import asyncio
+    monkeypatch.delattr(asyncio, 'start_unix_server', raising=False)
+    with pytest.raises(OSError):
+        SocketController('unix:/tmp/hebi-test-unsupported.sock')
+
+
+def test_active_only_while_a_client_is_connected():
+    controller = SocketController('tcp:127.0.0.1:0')
+    try:
+        port = controller._server.sockets[0].getsockname()[1]
+        assert not controller.active
+        client = ControllerClient(f'tcp:127.0.0.1:{port}')
+        assert wait_for(lambda: controller.active)
+        client.turn(UP)
+        assert wait_for(lambda: controller.poll(None))
+        client.close()
+        assert wait_for(lambda: not controller.active)
+    finally:
+        controller.close()
@@ -0,0 +1,76 @@
+import os
+import random
+
+from engine import DIRECTIONS
+from replay import GAME_OVER, END, ReplayReader, ReplayWriter, verify
+
+
+def record(board, path, seed=7, games=3, close=True):
+    """Play games with random turns into a replay, returns their (ticks, score)"""
+    engine = board.engine(seed)
+    writer = ReplayWriter(path, seed, board.cols, board.rows, 20, 15, board.walls)
+    rng = random.Random(seed)
+    played = []
+    while len(played) < games:
+        direction = rng.choice(DIRECTIONS)
+        if rng.random() < 0.3 and engine.turn(direction):
+            writer.turn(engine.ticks, direction)
+        if not engine.step():
+            writer.game_over(engine.ticks, engine.score)
+            played.append((engine.ticks, engine.score))
+            engine.reset()
+    if close:
+        writer.close(engine.ticks)
+    return writer, played
+
+
+def test_round_trip_verifies(tmp_path, board):
+    path = str(tmp_path / "session.hbr")
+    _, played = record(board, path)
+    with ReplayReader(path) as reader:
+        assert (reader.seed, reader.cols, reader.rows) == (7, board.cols, board.rows)
+        assert (reader.snake_block, reader.snake_speed) == (20, 15)
+        assert reader.walls == sorted(board.walls)
+        events = list(reader.events())
+    assert events[-1][1] == END
+    results = verify(path)
+    assert [(game["ticks"], game["score"]) for game in results] == played
+    assert all(game["ok"] for game in results)
+
+
+def test_session_without_events_leaves_no_file(tmp_path, board):
+    path = str(tmp_path / "idle.hbr")
+    ReplayWriter(path, 1, board.cols, board.rows, 20, 15).close(0)
+    assert not os.path.exists(path)
+
+
+def test_taken_name_is_not_overwritten(tmp_path, board):
+    path = str(tmp_path / "session.hbr")
+    first, _ = record(board, path, seed=1)
+    second, played = record(board, path, seed=2)
+    assert first.path == path
+    assert second.path == str(tmp_path / "session-1.hbr")
+    assert [(game["ticks"], game["score"]) for game in verify(path)] != played
+    assert [(game["ticks"], game["score"]) for game in verify(second.path)] == played
+
+
+def test_game_over_is_flushed(tmp_path, board):
+    path = str(tmp_path / "crashed.hbr")
+    writer, played = record(board, path, games=1, close=False)
+    # Nothing closed the writer, as after a crash
+    with ReplayReader(path) as reader:
+        assert [(tick, score) for tick, code, score in reader.events() if code == GAME_OVER] == played
+    assert all(game["ok"] for game in verify(path))
+    writer.close(0)
+
+
+def test_truncated_file_keeps_complete_games(tmp_path, board):
+    path = str(tmp_path / "torn.hbr")
+    _, played = record(board, path, games=2)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-3])
+    results = verify(path)
+    assert [(game["ticks"], game["score"]) for game in results] == played[:len(results)]
+    assert results and all(game["ok"] for game in results)
@@ -0,0 +1,67 @@
+import json
+
+from scores import HighScoreManager
+
+
+def lines(path):
+    with open(path, 'rb') as f:
+        return f.read().splitlines()
+
+
+def test_top_scores_and_reload(tmp_path):
+    path = str(tmp_path / "scores.json")
+    table = HighScoreManager(path, size=3)
+    for name, score in [("ann", 10), ("bob", 30), ("cy", 20), ("ann", 40), ("dee", 5)]:
+        table.add_score(name, score)
+    expected = [{"name": "ann", "score": 40}, {"name": "bob", "score": 30}, {"name": "cy", "score": 20}]
+    assert table.scores == expected
+    assert table.best("ann") == 40
+    assert table.is_high_score(21) and not table.is_high_score(20)
+    assert HighScoreManager(path, size=3).scores == expected
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    path = str(tmp_path / "scores.json")
+    table = HighScoreManager(path, size=5)
+    table.add_score("ann", 10)
+    table.add_score("bob", 20)
+    with open(path, 'ab') as f:
+        f.write(b'{"name": "cy", "sco')  # Crash halfway through a write
+    reloaded = HighScoreManager(path, size=5)
+    assert [entry["name"] for entry in reloaded.scores] == ["bob", "ann"]
+    # The next score starts on a line of its own instead of gluing onto the torn one
+    reloaded.add_score("dee", 30)
+    assert lines(path)[-1] == b'{"name": "dee", "score": 30}'
+    assert [entry["name"] for entry in HighScoreManager(path, size=5).scores] == ["dee", "bob", "ann"]
+
+
+def test_old_list_format_is_read(tmp_path):
+    path = str(tmp_path / "scores.json")
+    with open(path, 'w') as f:
+        json.dump([{"name": "ann", "score": 10}, {"name": "bob", "score": 20}], f)
+    table = HighScoreManager(path, size=5)
+    assert [entry["name"] for entry in table.scores] == ["bob", "ann"]
+    table.add_score("cy", 15)
+    assert [entry["name"] for entry in HighScoreManager(path, size=5).scores] == ["bob", "cy", "ann"]
+
+
+def test_compaction_keeps_top_entries_and_bests(tmp_path):
+    path = str(tmp_path / "scores.json")
+    table = HighScoreManager(path, size=3)
+    for i in range(200):
+        table.add_score(f"p{i % 5}", i)
+    assert len(lines(path)) <= HighScoreManager.COMPACT_RATIO * (3 + 5)
+    expected = [{"name": "p4", "score": 199}, {"name": "p3", "score": 198}, {"name": "p2", "score": 197}]
+    assert table.scores == expected
+    reloaded = HighScoreManager(path, size=3)
+    assert reloaded.scores == expected
+    assert {name: reloaded.best(name) for name in ("p0", "p1")} == {"p0": 195, "p1": 196}
+
+
+def test_scores_from_another_instance(tmp_path):
+    path = str(tmp_path / "scores.json")
+    first, second = HighScoreManager(path, size=3), HighScoreManager(path, size=3)
+    first.add_score("ann", 10)
+    second.add_score("bob", 20)
+    first.refresh()
+    assert [entry["name"] for entry in first.scores] == ["bob", "ann"]
@@ -0,0 +1,84 @@
+import sys
+
+import pytest
+
+from engine import SnakeEngine
+from state import GameState, resume, suspend
+
+
+def trace(engine, planner, ticks=500):
+    """What the game does next: (head, food, score) per tick"""
+    steps = []
+    for _ in range(ticks):
+        if not engine.step(planner.decide(engine)):
+            break
+        steps.append((engine.snake.head, engine.food, engine.score))
+    return steps, engine.death
+
+
+def test_pack_unpack_round_trip(board, played):
+    engine, _ = played()
+    state = GameState.capture(engine, seed=5)
+    copy = GameState.unpack(state.pack())
+    assert copy.values == state.values
+    assert (copy.cols, copy.rows, copy.seed, copy.score) == (board.cols, board.rows, 5, engine.score)
+    assert list(copy.body_cells) == list(engine.snake.body)
+    assert sorted(copy.wall_cells) == sorted(board.walls)
+
+
+def test_other_byte_order_is_swapped(played):
+    engine, _ = played()
+    state = GameState.capture(engine)
+    swapped = state.values[:]
+    swapped.byteswap()
+    other = GameState.from_buffer(swapped.tobytes(), little_endian=sys.byteorder != 'little')
+    assert other.values == state.values
+
+
+def test_restore_plays_on_identically(board, played):
+    engine, planner = played()
+    state = GameState.capture(engine)
+    fork = state.to_engine()
+    expected = trace(engine, planner)
+    assert trace(fork, board.planner()) == expected
+    assert GameState.capture(engine).values != state.values
+
+
+def test_save_and_load(tmp_path, board, played):
+    engine, planner = played()
+    path = str(tmp_path / "game.bin")
+    GameState.capture(engine).save(path)
+    fork = GameState.load(path).to_engine()
+    assert trace(fork, board.planner()) == trace(engine, planner)
+
+
+@pytest.mark.parametrize("data", [b"", b"HEBS", b"HEBR\x01\x01" + bytes(64), b"not a state at all"])
+def test_garbage_is_rejected(data):
+    with pytest.raises(ValueError):
+        GameState.unpack(data)
+
+
+def test_truncated_state_is_rejected(played):
+    engine, _ = played()
+    with pytest.raises(ValueError):
+        GameState.unpack(GameState.capture(engine).pack()[:-8])
+
+
+def test_suspend_and_resume(tmp_path, board, played):
+    engine, planner = played()
+    path = str(tmp_path / "suspend.bin")
+    suspend(engine, path, seed=5)
+    fresh = board.engine()
+    state = resume(fresh, path)
+    assert state is not None and state.seed == 5
+    assert not (tmp_path / "suspend.bin").exists()
+    assert trace(fresh, board.planner()) == trace(engine, planner)
+
+
+def test_resume_on_another_board_is_skipped(tmp_path, board, played):
+    engine, _ = played()
+    path = str(tmp_path / "suspend.bin")
+    suspend(engine, path)
+    assert resume(SnakeEngine(board.cols, board.rows), path) is None
+    assert not (tmp_path / "suspend.bin").exists()
+    assert resume(board.engine(), path) is None
@@ -0,0 +1,213 @@
+"""Autopilot tournament: many headless games over seeds and board sizes
+
+Games run on the engine the window plays with, without pygame or a frame
+clock, so a game takes as long as its planner needs. Each planner and
+board gets its seed range split into one shard per worker process;
+shard totals stream back as they finish and are merged into standings.
+
+    python tournament.py --planners bfs hamilton --boards 16x12 32x18 --seeds 200
+    python tournament.py --workers 4 --output standings.json
+    python tournament.py --planners lookahead --budget-ms 20 --workers 1 --search-workers 3
+"""
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from autopilot import PLANNERS
+from engine import SnakeEngine
+
+
+def play(planner_cls, cols, rows, seed, max_ticks, budget=None, search_workers=0):
+    """One game until it ends or stalls, returns (score, foods, ticks, death, rollouts)
+
+    A game that goes 2 * cols * rows ticks without eating is stopped as
+    'stalled' (a Hamiltonian tour reaches any food in fewer), one that
+    reaches max_ticks as 'timeout'. rollouts counts the simulations of
+    search planners, 0 for the others. search_workers goes to planners
+    that can search in extra processes and is ignored by the others.
+    """
+    engine = SnakeEngine(cols, rows, seed=seed)
+    options = {}
+    if search_workers and 'workers' in inspect.signature(planner_cls).parameters:
+        options['workers'] = search_workers
+    planner = planner_cls(cols, rows, budget=budget, **options)
+    decide, step = planner.decide, engine.step
+    patience = 2 * cols * rows
+    last_food = 0
+    death = 'timeout'
+    try:
+        while engine.ticks < max_ticks:
+            if not step(decide(engine)):
+                death = engine.death
+                break
+            if engine.ate:
+                last_food = engine.ticks
+            elif engine.ticks - last_food > patience:
+                death = 'stalled'
+                break
+    finally:
+        planner.close()
+    return engine.score, engine.length - 1, engine.ticks, death, getattr(planner, 'simulated', 0)
+
+
+def play_shard(planner, cols, rows, seeds, max_ticks, budget=None, search_workers=0):
+    """Totals over a range of seeds, run inside a worker process"""
+    planner_cls = PLANNERS[planner]
+    scores = []
+    foods = ticks = rollouts = 0
+    deaths = Counter()
+    start = time.perf_counter()
+    for seed in seeds:
+        score, eaten, moves, death, simulated = play(planner_cls, cols, rows, seed, max_ticks, budget,
+                                                    search_workers)
+        scores.append(score)
+        foods += eaten
+        ticks += moves
+        rollouts += simulated
+        deaths[death] += 1
+    return {
+        "planner": planner,
+        "board": f"{cols}x{rows}",
+        "worker": os.getpid(),
+        "games": len(scores),
+        "score_sum": sum(scores),
+        "score_max": max(scores, default=0),
+        "foods": foods,
+        "ticks": ticks,
+        "rollouts": rollouts,
+        "deaths": dict(deaths),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def shards(planners, boards, seeds, workers):
+    """(planner, cols, rows, seed range) tasks, one seed range per worker per pairing"""
+    step = -(-len(seeds) // workers)
+    for planner in planners:
+        for cols, rows in boards:
+            for i in range(0, len(seeds), step):
+                yield planner, cols, rows, seeds[i:i + step]
+
+
+class Standings:
+    """Shard totals merged per (planner, board) and per worker process"""
+    def __init__(self):
+        self.entries = {}
+        self.workers = {}
+
+    def add(self, shard):
+        key = (shard["planner"], shard["board"])
+        entry = self.entries.setdefault(key, {
+            "games": 0, "score_sum": 0, "score_max": 0, "foods": 0, "ticks": 0, "rollouts": 0,
+            "deaths": Counter(), "seconds": 0.0})
+        for name in ("games", "score_sum", "foods", "ticks", "rollouts", "seconds"):
+            entry[name] += shard[name]
+        entry["score_max"] = max(entry["score_max"], shard["score_max"])
+        entry["deaths"].update(shard["deaths"])
+        worker = self.workers.setdefault(shard["worker"], {"ticks": 0, "seconds": 0.0})
+        worker["ticks"] += shard["ticks"]
+        worker["seconds"] += shard["seconds"]
+
+    def summary(self):
+        """Per-pairing and per-worker statistics, JSON ready"""
+        pairings = []
+        for (planner, board), entry in sorted(self.entries.items()):
+            pairings.append({
+                "planner": planner,
+                "board": board,
+                "games": entry["games"],
+                "mean_score": entry["score_sum"] / entry["games"],
+                "max_score": entry["score_max"],
+                "moves_per_food": entry["ticks"] / max(entry["foods"], 1),
+                "deaths": dict(entry["deaths"]),
+                "ticks_per_sec": entry["ticks"] / max(entry["seconds"], 1e-9),
+                "rollouts_per_sec": entry["rollouts"] / max(entry["seconds"], 1e-9),
+            })
+        workers = {str(pid): worker["ticks"] / max(worker["seconds"], 1e-9)
+                   for pid, worker in sorted(self.workers.items())}
+        return {"pairings": pairings, "workers_ticks_per_sec": workers}
+
+
+def parse_board(text):
+    """'32x18' -> (32, 18)"""
+    try:
+        cols, rows = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"board must look like 32x18, not {text!r}")
+    if cols < 2 or rows < 2:
+        raise argparse.ArgumentTypeError("boards need at least 2x2 cells")
+    return cols, rows
+
+
+def run(planners, boards, seeds, workers, max_ticks, budget=None, progress=None, search_workers=0):
+    """Play every pairing over seeds in a pool of workers, returns the Standings"""
+    standings = Standings()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_shard, planner, cols, rows, shard_seeds, max_ticks, budget,
+                               search_workers)
+                   for planner, cols, rows, shard_seeds in shards(planners, boards, seeds, workers)]
+        for future in as_completed(futures):
+            shard = future.result()
+            standings.add(shard)
+            if progress:
+                progress(shard)
+    return standings
+
+
+def _print_shard(shard):
+    rate = shard["ticks"] / max(shard["seconds"], 1e-9)
+    print(f"  {shard['planner']:>9} {shard['board']:>7}: {shard['games']} games, "
+          f"mean {shard['score_sum'] / shard['games']:.1f}, {rate:,.0f} ticks/s "
+          f"(worker {shard['worker']})", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play autopilots against each other headlessly")
+    parser.add_argument('--planners', nargs='+', choices=sorted(PLANNERS), default=sorted(PLANNERS))
+    parser.add_argument('--boards', nargs='+', type=parse_board, default=[(16, 12), (32, 18)],
+                        metavar='COLSxROWS')
+    parser.add_argument('--seeds', type=int, default=100, help="games per pairing, seeds 0..N-1")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-ticks', type=int, default=1_000_000, help="cut a game off after this many")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="planning time per move, unlimited by default")
+    parser.add_argument('--search-workers', type=int, default=0, metavar='N',
+                        help="extra processes each lookahead game searches in")
+    parser.add_argument('--output', help="also write the standings to this JSON file")
+    args = parser.parse_args(argv)
+    if args.seeds < 1 or args.workers < 1:
+        parser.error("--seeds and --workers must be positive")
+    if args.search_workers < 0:
+        parser.error("--search-workers can't be negative")
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    budget = args.budget_ms / 1000 if args.budget_ms else None
+    start = time.perf_counter()
+    standings = run(args.planners, args.boards, seeds, args.workers, args.max_ticks, budget,
+                    progress=_print_shard, search_workers=args.search_workers)
+    elapsed = time.perf_counter() - start
+    summary = standings.summary()
+    summary["seconds"] = elapsed
+
+    print(f"{'planner':>9} {'board':>7} {'games':>6} {'mean':>8} {'max':>6} "
+          f"{'moves/food':>11} {'ticks/s':>10} {'rollouts/s':>11}  deaths")
+    for row in summary["pairings"]:
+        deaths = ", ".join(f"{cause} {count}" for cause, count in sorted(row["deaths"].items()))
+        print(f"{row['planner']:>9} {row['board']:>7} {row['games']:>6} {row['mean_score']:>8.1f} "
+              f"{row['max_score']:>6} {row['moves_per_food']:>11.1f} {row['ticks_per_sec']:>10,.0f} "
+              f"{row['rollouts_per_sec']:>11,.0f}  {deaths}")
+    rates = summary["workers_ticks_per_sec"].values()
+    print(f"{len(rates)} workers, {sum(rates):,.0f} ticks/s combined, {elapsed:.1f} s wall")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import sys
+
+import pygame
+
+
+class WindowBackend:
+    """Plain window fallback: the colorkey background stays visible
+
+    Backends make the borderless game window see-through wherever the
+    colorkey is drawn. Their platform modules are imported only when a
+    backend is applied, so importing this module costs nothing extra.
+    """
+    name = 'plain'
+
+    def prepare(self):
+        """Process-wide setup, before the display is initialized"""
+
+    def apply(self, rect, colorkey):
+        """Style the window created by pygame.display.set_mode
+
+        rect is the (x, y, width, height) desktop area it must cover.
+        """
+
+
+class Win32Backend(WindowBackend):
+    """Layered, topmost window with the colorkey punched out"""
+    name = 'win32'
+
+    def prepare(self):
+        # Work in physical pixels so monitors with different scaling line up
+        import ctypes
+        try:
+            ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Per-monitor aware
+        except (AttributeError, OSError):
+            ctypes.windll.user32.SetProcessDPIAware()
+
+    def apply(self, rect, colorkey):
+        import win32api
+        import win32con
+        import win32gui
+
+        hwnd = pygame.display.get_wm_info()["window"]
+        win32gui.SetWindowLong(
+            hwnd,
+            win32con.GWL_EXSTYLE,
+            win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) | win32con.WS_EX_LAYERED
+        )
+        win32gui.SetLayeredWindowAttributes(
+            hwnd, win32api.RGB(*colorkey), 0, win32con.LWA_COLORKEY
+        )
+        win32gui.SetWindowPos(
+            hwnd, win32con.HWND_TOPMOST, *rect, 0
+        )
+
+
+BACKENDS = {
+    'win32': Win32Backend,
+    'plain': WindowBackend,
+}
+
+
+def get_backend(name=None):
+    """Backend by name, or the best one for this platform"""
+    if name is None:
+        name = 'win32' if sys.platform == 'win32' else 'plain'
+    return BACKENDS[name]()
+
+
+def monitor_rects():
+    """Every monitor as an (x, y, width, height) desktop rect, primary first
+
+    Needs screeninfo for positions; without it only the primary monitor
+    is known.
+    """
+    try:
+        from screeninfo import get_monitors
+        monitors = get_monitors()
+    except Exception:  # Not installed, or no monitor could be enumerated
+        monitors = []
+    if not monitors:
+        return [(0, 0) + tuple(desktop_size())]
+    monitors.sort(key=lambda m: not m.is_primary)
+    return [(m.x, m.y, m.width, m.height) for m in monitors]
+
+
+def desktop_size():
+    """Size of the primary monitor; the display must be initialized"""
+    sizes = pygame.display.get_desktop_sizes()
+    if sizes:
+        return sizes[0]
+    from screeninfo import get_monitors
+    monitor = get_monitors()[0]
+    return monitor.width, monitor.height